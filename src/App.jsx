@@ -57,12 +57,15 @@ function App() {
   useEffect(() => {
     let interval;
     let isMounted = true;
+    // Les logs ne sont pas affichés ici : on ne demande que les nouveaux
+    let lastLogSeq = null;
 
     const fetchStats = async () => {
       if (!isMounted) return;
 
-      const raw = await requestWorker("get_monitoring");
+      const raw = await requestWorker("get_monitoring", lastLogSeq === null ? {} : { since_seq: lastLogSeq });
       if (!raw || !isMounted) return;
+      if (typeof raw.log_seq === 'number') lastLogSeq = raw.log_seq;
 
       setSystemStats({
         cpu: normalizeStat(raw.cpu),
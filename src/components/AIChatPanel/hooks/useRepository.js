@@ -35,7 +35,9 @@ export const useRepository = (language, onRepositoryAnalyzed) => {
           const response = await requestWorker("analyze_repository", {
             repo_path: selected,
             max_depth: 5,
-            max_files: 500
+            max_files: 500,
+            // Sélection explicite : toujours une analyse fraîche
+            refresh: true
           });
 
           if (response?.success && response?.analysis) {
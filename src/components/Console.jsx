@@ -2,16 +2,28 @@ import React, { useState, useEffect, useRef } from 'react';
 import { Terminal, Copy, Check, Loader2 } from 'lucide-react';
 import { requestWorker } from '../services/bridge';
 
+// Même limite que le buffer côté worker (MonitoringService)
+const MAX_LOGS = 100;
+
 const Console = ({ isDarkMode }) => {
   const [logs, setLogs] = useState([]);
   const [copied, setCopied] = useState(false);
   const [isLoading, setIsLoading] = useState(true);
   const containerRef = useRef(null);
+  // Dernier numéro de séquence reçu : le worker ne renvoie que les nouveaux logs
+  const lastSeqRef = useRef(null);
 
   const fetchLogs = async () => {
     try {
-      const response = await requestWorker("get_monitoring");
-      setLogs(response?.logs || []);
+      const payload = lastSeqRef.current === null ? {} : { since_seq: lastSeqRef.current };
+      const response = await requestWorker("get_monitoring", payload);
+      const newLogs = response?.logs || [];
+      if (response?.logs_full || lastSeqRef.current === null) {
+        setLogs(newLogs);
+      } else if (newLogs.length > 0) {
+        setLogs(prev => [...prev, ...newLogs].slice(-MAX_LOGS));
+      }
+      if (typeof response?.log_seq === 'number') lastSeqRef.current = response.log_seq;
       setIsLoading(false);
     } catch (error) { 
       setIsLoading(false);
@@ -164,7 +164,9 @@ const RepoAnalyzer = ({ language = 'fr', isDarkMode = true }) => {
       const response = await requestWorker("analyze_repository", {
         repo_path: repoPath,
         max_depth: 10,
-        max_files: 1000
+        max_files: 1000,
+        // Analyse explicite : toujours refaite (le cache ne voit pas les sous-dossiers)
+        refresh: true
       });
 
       if (response?.success) {
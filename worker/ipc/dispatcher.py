@@ -85,7 +85,7 @@ class CommandDispatcher:
             client_id = payload.get("client_id", "unknown")
 
             # Pour les commandes sensibles, appliquer le rate limiting
-            if cmd in rate_limiter.get_limits():
+            if rate_limiter.has_limit(cmd):
                 allowed, retry_after = rate_limiter.check_limit(cmd, client_id)
                 if not allowed:
                     print(f"[SECURITY] Rate limit exceeded for {cmd} from {client_id}. Blocked for {retry_after} seconds", file=sys.stderr)
@@ -121,7 +121,7 @@ class CommandDispatcher:
         
         # --- SYSTÈME & MONITORING ---
         if cmd in ["get_system_stats", "get_monitoring"]:
-            return monitoring_service.get_monitoring_info()
+            return monitoring_service.get_monitoring_info(payload.get("since_seq"))
         
         if cmd == "set_startup":
             return system_service.manage_startup(payload.get("enable", False))
@@ -782,6 +782,8 @@ class CommandDispatcher:
                 repo_path = payload.get("repo_path")
                 max_depth = payload.get("max_depth", 10)
                 max_files = payload.get("max_files", 1000)
+                # refresh=True : ignorer l'analyse en cache (action "analyser" explicite)
+                refresh = bool(payload.get("refresh", False))
                 
                 if not repo_path:
                     return {"success": False, "error": "repo_path is required"}
@@ -807,7 +809,8 @@ class CommandDispatcher:
                     analysis = repo_analyzer_service.analyze_repository(
                         repo_path=repo_path,
                         max_depth=max_depth,
-                        max_files=max_files
+                        max_files=max_files,
+                        use_cache=not refresh
                     )
                     
                     # Convertir en dict pour JSON
@@ -854,11 +857,12 @@ class CommandDispatcher:
                 return {"success": False, "error": "repo_analyzer_service is None"}
             
             repo_path = payload.get("repo_path")
+            refresh = bool(payload.get("refresh", False))
             if not repo_path:
                 return {"success": False, "error": "repo_path is required"}
             
             try:
-                analysis = repo_analyzer_service.analyze_repository(repo_path)
+                analysis = repo_analyzer_service.analyze_repository(repo_path, use_cache=not refresh)
                 return {
                     "success": True,
                     "summary": analysis.summary
@@ -878,6 +882,7 @@ class CommandDispatcher:
             
             repo_path = payload.get("repo_path")
             max_files = payload.get("max_files", 1000)
+            refresh = bool(payload.get("refresh", False))
             
             if not repo_path:
                 return {"success": False, "error": "repo_path is required"}
@@ -885,7 +890,8 @@ class CommandDispatcher:
             try:
                 analysis = repo_analyzer_service.analyze_repository(
                     repo_path=repo_path,
-                    max_files=max_files
+                    max_files=max_files,
+                    use_cache=not refresh
                 )
                 return {
                     "success": True,
@@ -0,0 +1,91 @@
+"""
+Background Queue pour Horizon AI V2
+===================================
+File d'écritures d'arrière-plan (audit, logs) partagée par les services.
+
+Centralise le pattern de memory_service, prompt_builder_service, project_service :
+- File non bornée (queue.Queue) : aucun événement n'est écarté
+- Un thread daemon bloqué sur get() : aucun réveil tant que la file est vide
+- Traitement par lot, dans l'ordre d'arrivée
+- Vidage à la fermeture (atexit) et à la demande (flush)
+
+Usage:
+    from services.background_queue import BackgroundQueue
+
+    def write_entries(entries):
+        ...  # Écrit le lot (liste d'éléments, ordre conservé)
+
+    log_queue = BackgroundQueue("prompt-log", write_entries)
+    log_queue.put({"id": 1})
+    log_queue.flush()  # Attend que tout soit écrit
+"""
+
+import sys
+import queue
+import atexit
+import threading
+from typing import Any, Callable, List, Optional
+
+
+class BackgroundQueue:
+    """
+    File traitée par un thread daemon démarré au premier put()
+    
+    Le handler reçoit des lots (listes) ; s'il lève une exception, le lot est
+    perdu et l'abandon est journalisé sur stderr (jamais silencieux).
+    """
+    
+    def __init__(self, name: str, handler: Callable[[List[Any]], None]):
+        """
+        Args:
+            name: Nom du thread et préfixe des messages d'erreur
+            handler: Fonction appelée avec chaque lot d'éléments
+        """
+        self.name = name
+        self._handler = handler
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        atexit.register(self.flush)
+    
+    def put(self, item: Any):
+        """Ajoute un élément à la file (non bloquant)"""
+        self._queue.put(item)
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._worker, name=self.name, daemon=True)
+                    self._thread.start()
+    
+    def flush(self):
+        """Attend que tous les éléments mis en file soient traités"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+            return
+        # Pas de thread (aucun put, ou fermeture) : traitement dans l'appelant
+        batch = self._drain([])
+        if batch:
+            self._process(batch)
+    
+    def _worker(self):
+        """Thread daemon : bloqué sur get() jusqu'au prochain élément"""
+        while True:
+            self._process(self._drain([self._queue.get()]))
+    
+    def _drain(self, batch: List[Any]) -> List[Any]:
+        """Ajoute à batch les éléments déjà en file, sans attendre"""
+        try:
+            while True:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            return batch
+    
+    def _process(self, batch: List[Any]):
+        """Passe un lot au handler ; un échec est journalisé, jamais silencieux"""
+        try:
+            self._handler(batch)
+        except Exception as e:
+            print(f"[{self.name}] Dropped {len(batch)} queued item(s): {e}", file=sys.stderr)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
@@ -4,7 +4,7 @@ import sys
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional
 
 # Import crypto service pour chiffrement optionnel
 try:
@@ -14,6 +14,9 @@ except ImportError:
     CRYPTO_AVAILABLE = False
     CryptoService = None
 
+# Sentinelle de _set_project_link : pas de filtre sur le projectId actuel
+_ANY_PROJECT = object()
+
 class ChatHistoryService:
     def __init__(self, storage_path=None):
         # ✅ Utiliser AppData pour le stockage (évite les problèmes de permissions)
@@ -271,6 +274,26 @@ class ChatHistoryService:
             print(f"[ChatHistoryService] Error counting conversations for project {project_id}: {e}", file=sys.stderr)
             return 0
     
+    def get_conversation_counts(self, project_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Compte les conversations de plusieurs projets en une seule lecture (V2.1)
+        
+        Args:
+            project_ids: UUIDs des projets
+            
+        Returns:
+            Dictionnaire project_id -> nombre de conversations (0 si aucune)
+        """
+        counts = dict.fromkeys(project_ids, 0)
+        try:
+            for conv in self.list_conversations():
+                project_id = conv.get('projectId')
+                if project_id in counts:
+                    counts[project_id] += 1
+        except Exception as e:
+            print(f"[ChatHistoryService] Error counting conversations by project: {e}", file=sys.stderr)
+        return counts
+    
     def list_conversations_by_project(self, project_id: str):
         """
         Liste toutes les conversations d'un projet (V2.1)
@@ -303,6 +326,42 @@ class ChatHistoryService:
         if not os.path.exists(path):
             return False
         
+        return self._set_project_link(path, project_id)
+    
+    def detach_project_conversations(self, project_id: str) -> int:
+        """
+        Retire le lien vers un projet de toutes ses conversations (V2.1)
+        
+        Une seule passe : chaque fichier est lu une fois (au lieu de
+        list_conversations_by_project puis une relecture par conversation).
+        
+        Args:
+            project_id: UUID du projet supprimé
+            
+        Returns:
+            Nombre de conversations mises à jour
+        """
+        updated = 0
+        for filename in os.listdir(self.storage_path):
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(self.storage_path, filename)
+            if self._set_project_link(path, None, only_from=project_id):
+                updated += 1
+        return updated
+    
+    def _set_project_link(self, path: str, project_id: Optional[str], only_from: Any = _ANY_PROJECT) -> bool:
+        """
+        Réécrit le projectId d'un fichier de conversation
+        
+        Args:
+            path: Chemin du fichier de conversation
+            project_id: Nouveau projectId (None pour retirer le lien)
+            only_from: Si fourni, ne modifie que si le projectId actuel est égal
+            
+        Returns:
+            True si mis à jour, False sinon
+        """
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -320,6 +379,9 @@ class ChatHistoryService:
                 data = json.loads(content) if content.strip() else {}
                 should_encrypt = False
             
+            if only_from is not _ANY_PROJECT and data.get('projectId') != only_from:
+                return False
+            
             # Mettre à jour projectId
             data['projectId'] = project_id
             data['updated_at'] = datetime.now().isoformat()
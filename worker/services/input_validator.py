@@ -10,11 +10,30 @@ Valide les entrées utilisateur pour prévenir:
 SÉCURITÉ CRITIQUE - Couche de validation supplémentaire
 """
 
-import re
 import sys
+import json
+import string
 from typing import Tuple, Optional, Dict, Any
 from ipaddress import ip_address, AddressValueError
 
+# Caractères autorisés dans un nom de modèle Ollama (alphanumérique + :._/-).
+# La table supprime tous les caractères autorisés : s'il reste quelque chose
+# après translate(), le nom contient un caractère invalide.
+_MODEL_NAME_ALLOWED = frozenset(string.ascii_letters + string.digits + ':._/-')
+_MODEL_NAME_BAD_TBL = str.maketrans('', '', ''.join(_MODEL_NAME_ALLOWED))
+
+# Même principe pour les tokens (alphanumérique + -_=+/.), et classes de
+# caractères précalculées pour le calcul d'entropie (intersection d'ensembles
+# au lieu de 4 re.search par token)
+_TOKEN_SYMBOLS = frozenset('-_=+/.')
+_TOKEN_BAD_TBL = str.maketrans('', '', string.ascii_letters + string.digits + ''.join(_TOKEN_SYMBOLS))
+_TOKEN_CHAR_CLASSES = (
+    frozenset(string.ascii_lowercase),
+    frozenset(string.ascii_uppercase),
+    frozenset(string.digits),
+    _TOKEN_SYMBOLS,
+)
+
 class InputValidator:
     """
     Validateur d'entrées utilisateur pour les commandes sensibles
@@ -32,6 +51,13 @@ class InputValidator:
         self.max_token_length = 128
         self.max_ip_length = 45  # IPv6 max length
 
+        # Import unique de path_validator (None → fallback validation basique)
+        try:
+            from services.path_validator import path_validator
+            self._path_validator = path_validator
+        except ImportError:
+            self._path_validator = None
+
     def validate_token(self, token: str, min_length: int = 8, max_length: Optional[int] = None) -> Tuple[bool, str]:
         """
         Valide un token d'authentification
@@ -58,19 +84,12 @@ class InputValidator:
             return False, f"Token too long (max {max_length} characters)"
 
         # 3. Vérifier caractères valides (alphanumérique + quelques symboles)
-        if not re.match(r'^[a-zA-Z0-9\-_=+/.]+$', token):
+        if token.translate(_TOKEN_BAD_TBL):
             return False, "Token contains invalid characters"
 
-        # 4. Vérifier entropie minimale (au moins 3 types de caractères différents)
-        char_types = 0
-        if re.search(r'[a-z]', token):
-            char_types += 1
-        if re.search(r'[A-Z]', token):
-            char_types += 1
-        if re.search(r'[0-9]', token):
-            char_types += 1
-        if re.search(r'[-_=+/.]', token):
-            char_types += 1
+        # 4. Vérifier entropie minimale (au moins 2 types de caractères différents)
+        chars = set(token)
+        char_types = sum(1 for char_class in _TOKEN_CHAR_CLASSES if not chars.isdisjoint(char_class))
 
         if char_types < 2:
             return False, "Token too weak (needs more character variety)"
@@ -125,7 +144,6 @@ class InputValidator:
         """
         try:
             # Convertir en JSON pour calculer la taille
-            import json
             payload_str = json.dumps(payload)
             payload_size = len(payload_str.encode('utf-8'))
 
@@ -146,12 +164,12 @@ class InputValidator:
         Returns:
             (is_valid, error_message)
         """
-        try:
-            from services.path_validator import path_validator
-            return path_validator.is_safe_repo_path(path_str)
-        except ImportError:
+        if self._path_validator is None:
             # Fallback si path_validator pas disponible
             return self._basic_path_validation(path_str)
+
+        try:
+            return self._path_validator.is_safe_repo_path(path_str)
         except Exception as e:
             return False, f"Repository path validation error: {str(e)}"
 
@@ -200,7 +218,7 @@ class InputValidator:
             return False, "Model name too long"
 
         # 3. Vérifier format valide (alphanumérique + quelques symboles)
-        if not re.match(r'^[a-zA-Z0-9:._/-]+$', model_name):
+        if model_name.translate(_MODEL_NAME_BAD_TBL):
             return False, "Model name contains invalid characters"
 
         # 4. Vérifier pas de path traversal
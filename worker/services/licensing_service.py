@@ -17,10 +17,15 @@ DEFAULT_STATUS: Dict[str, Any] = {
 }
 
 
+def _fresh_default() -> Dict[str, Any]:
+    # DEFAULT_STATUS est plat : copie superficielle + liste neuve suffisent
+    return {**DEFAULT_STATUS, "entitlements": []}
+
+
 class LicensingService:
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._status: Dict[str, Any] = copy.deepcopy(DEFAULT_STATUS)
+        self._status: Dict[str, Any] = _fresh_default()
 
     def get_status_snapshot(self) -> Dict[str, Any]:
         with self._lock:
@@ -30,7 +35,7 @@ class LicensingService:
         if not isinstance(snapshot, dict):
             return
         with self._lock:
-            merged = copy.deepcopy(DEFAULT_STATUS)
+            merged = _fresh_default()
             merged.update(snapshot)
             self._status = merged
 
@@ -19,9 +19,11 @@ import sys
 import json
 import uuid
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+from services.background_queue import BackgroundQueue
 
 # Import des services
 try:
@@ -33,8 +35,23 @@ except ImportError:
     audit_service = None
     ActionType = None
 
+# Sérialisation JSON : orjson (C, sortie bytes) si disponible, sinon encodeur
+# C compact de la stdlib (pas d'indent, qui force le chemin pur Python)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
+
 
-@dataclass
+@dataclass(slots=True)
 class MemoryEntry:
     """Entrée de mémoire"""
     key: str
@@ -52,6 +69,18 @@ class MemoryEntry:
             self.updated_at = datetime.now().isoformat()
         if self.metadata is None:
             self.metadata = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertit en dict (superficiel : value/metadata par référence, pas de copie récursive)"""
+        return {
+            "key": self.key,
+            "value": self.value,
+            "memory_type": self.memory_type,
+            "project_id": self.project_id,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "metadata": self.metadata
+        }
 
 
 class MemoryService:
@@ -84,6 +113,18 @@ class MemoryService:
         # Mémoire session (temporaire, en mémoire uniquement)
         self.session_memory: Dict[str, Any] = {}
         
+        # Audit asynchrone : les événements sont mis en file et écrits par un
+        # thread d'arrière-plan, hors du chemin d'écriture mémoire.
+        # La mémoire session (éphémère) n'est pas auditée par défaut.
+        self.audit_session = False
+        self._audit = audit_service  # None si audit indisponible (résolu une fois)
+        self._audit_queue = BackgroundQueue("memory-audit", self._write_audit)
+        
+        # Miroir en mémoire des stores persistants déjà déchiffrés :
+        # file_path -> ((st_mtime_ns, st_size), JSON déchiffré). Invalidé si le
+        # fichier a changé sur disque depuis la dernière lecture/écriture.
+        self._file_cache: Dict[Path, Tuple[Tuple[int, int], bytes]] = {}
+        
         # Service de chiffrement
         self.crypto_service: Optional[CryptoService] = None
         if CRYPTO_AVAILABLE:
@@ -106,7 +147,10 @@ class MemoryService:
             return False
         
         try:
-            return self.crypto_service.set_password(password)
+            result = self.crypto_service.set_password(password)
+            # Nouvelle clé : les stores en cache ne sont plus forcément lisibles
+            self._file_cache.clear()
+            return result
         except Exception:
             return False
     
@@ -139,49 +183,55 @@ class MemoryService:
             if memory_type == "project" and not project_id:
                 return False
             
-            # Créer l'entrée
-            entry = MemoryEntry(
-                key=key,
-                value=value,
-                memory_type=memory_type,
-                project_id=project_id,
-                metadata=metadata or {}
-            )
-            
             # Sauvegarder selon le type
             if memory_type == "session":
-                # Session : stockage en mémoire uniquement
-                self.session_memory[key] = asdict(entry)
-                entry.updated_at = datetime.now().isoformat()
-                self.session_memory[key] = asdict(entry)
+                # Session : stockage en mémoire uniquement (dict construit
+                # directement, pas de dataclass ni d'asdict)
+                now = datetime.now().isoformat()
+                self.session_memory[key] = {
+                    "key": key,
+                    "value": value,
+                    "memory_type": "session",
+                    "project_id": project_id,
+                    "created_at": now,
+                    "updated_at": now,
+                    "metadata": metadata or {}
+                }
             else:
                 # User ou Project : stockage persistant avec chiffrement
+                entry = MemoryEntry(
+                    key=key,
+                    value=value,
+                    memory_type=memory_type,
+                    project_id=project_id,
+                    metadata=metadata or {}
+                )
                 self._save_persistent_memory(entry)
             
             # Audit trail
-            if audit_service:
-                audit_service.log_action(
-                    ActionType.MEMORY_WRITE,
-                    {
-                        "memory_type": memory_type,
-                        "key": key,
-                        "project_id": project_id,
-                        "has_value": value is not None
-                    }
-                )
+            self._queue_audit(
+                memory_type,
+                "MEMORY_WRITE",
+                {
+                    "memory_type": memory_type,
+                    "key": key,
+                    "project_id": project_id,
+                    "has_value": value is not None
+                }
+            )
             
             return True
             
         except Exception as e:
-            if audit_service:
-                audit_service.log_action(
-                    ActionType.MEMORY_WRITE,
-                    {
-                        "error": str(e),
-                        "memory_type": memory_type,
-                        "key": key
-                    }
-                )
+            self._queue_audit(
+                memory_type,
+                "MEMORY_WRITE",
+                {
+                    "error": str(e),
+                    "memory_type": memory_type,
+                    "key": key
+                }
+            )
             return False
     
     def _save_persistent_memory(self, entry: MemoryEntry):
@@ -194,51 +244,117 @@ class MemoryService:
             return
         
         # Charger les données existantes
-        data = {}
-        if file_path.exists():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                    # Détecter si chiffré (préfixe "ENC:")
-                    if content.startswith("ENC:"):
-                        if not self.crypto_service or not self.crypto_service._master_key:
-                            # Pas de clé, on ne peut pas déchiffrer
-                            data = {}
-                        else:
-                            encrypted_data = content[4:]  # Enlever "ENC:"
-                            try:
-                                decrypted = self.crypto_service.decrypt_string(encrypted_data)
-                                data = json.loads(decrypted)
-                            except Exception:
-                                data = {}
-                    else:
-                        # Données en clair
-                        data = json.loads(content) if content.strip() else {}
-            except Exception:
-                data = {}
+        data = self._load_store(file_path)
         
         # Mettre à jour l'entrée
         if "entries" not in data:
             data["entries"] = {}
         
-        entry_dict = asdict(entry)
+        entry_dict = entry.to_dict()
         entry_dict["updated_at"] = datetime.now().isoformat()
         data["entries"][entry.key] = entry_dict
         data["last_updated"] = datetime.now().isoformat()
         
         # Sauvegarder (chiffré si crypto disponible)
-        json_data = json.dumps(data, indent=2, ensure_ascii=False)
+        self._write_store(file_path, data)
+    
+    def _load_store(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Charge un store persistant (déchiffré si nécessaire)
+        
+        Le JSON déchiffré est servi depuis le cache tant que le fichier n'a
+        pas changé sur disque (mtime + taille), ce qui évite de relire et
+        redéchiffrer tout le fichier à chaque opération. Chaque appel parse
+        un nouveau dict : l'appelant peut le modifier sans altérer le cache.
+        
+        Args:
+            file_path: Chemin du fichier de mémoire
+            
+        Returns:
+            Données du store, {} si inexistant, vide ou illisible
+        """
+        try:
+            st = file_path.stat()
+        except OSError:
+            self._file_cache.pop(file_path, None)
+            return {}
+        
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._file_cache.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return _loads(cached[1])
+        
+        try:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+        except Exception:
+            return {}
+        
+        # Détecter si chiffré (préfixe "ENC:")
+        if content.startswith(b"ENC:"):
+            if not self.crypto_service or not self.crypto_service._master_key:
+                # Pas de clé, on ne peut pas déchiffrer
+                return {}
+            try:
+                json_data = self.crypto_service.decrypt(content[4:])  # Enlever "ENC:"
+                data = _loads(json_data)
+            except Exception:
+                return {}
+        else:
+            # Données en clair
+            if not content.strip():
+                return {}
+            try:
+                json_data = content
+                data = _loads(json_data)
+            except Exception:
+                return {}
+        
+        if not isinstance(data, dict):
+            return {}
+        
+        self._file_cache[file_path] = (signature, json_data)
+        return data
+    
+    def _write_store(self, file_path: Path, data: Dict[str, Any]):
+        """
+        Écrit un store persistant (chiffré si crypto disponible) et met à jour le cache
+        
+        Args:
+            file_path: Chemin du fichier de mémoire
+            data: Données complètes du store
+        """
+        # Invalider d'abord : si l'écriture échoue, le cache ne doit pas
+        # refléter des données qui ne sont pas sur disque
+        self._file_cache.pop(file_path, None)
+        
+        json_data = _dumps(data)
         
         if self.crypto_service and self.crypto_service._master_key:
             # Chiffrer
-            encrypted = self.crypto_service.encrypt_string(json_data)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write("ENC:" + encrypted)
+            content = b"ENC:" + self.crypto_service.encrypt(json_data)
         else:
             # En clair
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(json_data)
+            content = json_data
+        
+        # Écriture atomique : fichier temporaire + os.replace, pour qu'un
+        # crash en cours d'écriture ne laisse jamais un store tronqué
+        tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except Exception:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        
+        st = file_path.stat()
+        self._file_cache[file_path] = ((st.st_mtime_ns, st.st_size), json_data)
     
     def get_memory(
         self,
@@ -274,24 +390,7 @@ class MemoryService:
             else:
                 return None
             
-            if not file_path.exists():
-                return None
-            
-            # Lire et déchiffrer si nécessaire
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if content.startswith("ENC:"):
-                if not self.crypto_service or not self.crypto_service._master_key:
-                    return None
-                encrypted_data = content[4:]
-                try:
-                    decrypted = self.crypto_service.decrypt_string(encrypted_data)
-                    data = json.loads(decrypted)
-                except Exception:
-                    return None
-            else:
-                data = json.loads(content) if content.strip() else {}
+            data = self._load_store(file_path)
             
             # Récupérer l'entrée
             entries = data.get("entries", {})
@@ -342,24 +441,7 @@ class MemoryService:
             else:
                 return []
             
-            if not file_path.exists():
-                return []
-            
-            # Lire et déchiffrer si nécessaire
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if content.startswith("ENC:"):
-                if not self.crypto_service or not self.crypto_service._master_key:
-                    return []
-                encrypted_data = content[4:]
-                try:
-                    decrypted = self.crypto_service.decrypt_string(encrypted_data)
-                    data = json.loads(decrypted)
-                except Exception:
-                    return []
-            else:
-                data = json.loads(content) if content.strip() else {}
+            data = self._load_store(file_path)
             
             # Retourner la liste (sans valeurs pour la sécurité)
             entries = data.get("entries", {})
@@ -401,14 +483,14 @@ class MemoryService:
                     del self.session_memory[key]
                     
                     # Audit trail
-                    if audit_service:
-                        audit_service.log_action(
-                            ActionType.MEMORY_DELETE,
-                            {
-                                "memory_type": "session",
-                                "key": key
-                            }
-                        )
+                    self._queue_audit(
+                        "session",
+                        "MEMORY_DELETE",
+                        {
+                            "memory_type": "session",
+                            "key": key
+                        }
+                    )
                     return True
                 return False
             
@@ -422,24 +504,7 @@ class MemoryService:
             else:
                 return False
             
-            if not file_path.exists():
-                return False
-            
-            # Charger, modifier, sauvegarder
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if content.startswith("ENC:"):
-                if not self.crypto_service or not self.crypto_service._master_key:
-                    return False
-                encrypted_data = content[4:]
-                try:
-                    decrypted = self.crypto_service.decrypt_string(encrypted_data)
-                    data = json.loads(decrypted)
-                except Exception:
-                    return False
-            else:
-                data = json.loads(content) if content.strip() else {}
+            data = self._load_store(file_path)
             
             # Supprimer l'entrée
             entries = data.get("entries", {})
@@ -449,41 +514,33 @@ class MemoryService:
                 data["last_updated"] = datetime.now().isoformat()
                 
                 # Sauvegarder
-                json_data = json.dumps(data, indent=2, ensure_ascii=False)
-                
-                if self.crypto_service and self.crypto_service._master_key:
-                    encrypted = self.crypto_service.encrypt_string(json_data)
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write("ENC:" + encrypted)
-                else:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(json_data)
+                self._write_store(file_path, data)
                 
                 # Audit trail
-                if audit_service:
-                    audit_service.log_action(
-                        ActionType.MEMORY_DELETE,
-                        {
-                            "memory_type": memory_type,
-                            "key": key,
-                            "project_id": project_id
-                        }
-                    )
+                self._queue_audit(
+                    memory_type,
+                    "MEMORY_DELETE",
+                    {
+                        "memory_type": memory_type,
+                        "key": key,
+                        "project_id": project_id
+                    }
+                )
                 
                 return True
             
             return False
             
         except Exception as e:
-            if audit_service:
-                audit_service.log_action(
-                    ActionType.MEMORY_DELETE,
-                    {
-                        "error": str(e),
-                        "memory_type": memory_type,
-                        "key": key
-                    }
-                )
+            self._queue_audit(
+                memory_type,
+                "MEMORY_DELETE",
+                {
+                    "error": str(e),
+                    "memory_type": memory_type,
+                    "key": key
+                }
+            )
             return False
     
     def clear_session_memory(self) -> bool:
@@ -498,19 +555,51 @@ class MemoryService:
             self.session_memory.clear()
             
             # Audit trail
-            if audit_service:
-                audit_service.log_action(
-                    ActionType.MEMORY_DELETE,
-                    {
-                        "memory_type": "session",
-                        "action": "clear_all",
-                        "count": count
-                    }
-                )
+            self._queue_audit(
+                "session",
+                "MEMORY_DELETE",
+                {
+                    "memory_type": "session",
+                    "action": "clear_all",
+                    "count": count
+                }
+            )
             
             return True
         except Exception:
             return False
+    
+    def _queue_audit(self, memory_type: str, action_name: str, details: Dict[str, Any]):
+        """
+        Met un événement d'audit en file (écrit de manière asynchrone)
+        
+        Args:
+            memory_type: Type de mémoire concerné (session ignorée sauf si audit_session)
+            action_name: Nom du membre ActionType (ex: "MEMORY_WRITE")
+            details: Détails de l'action
+        """
+        if memory_type == "session" and not self.audit_session:
+            return
+        if self._audit is None:
+            return
+        
+        self._audit_queue.put((action_name, details))
+    
+    def flush_audit(self):
+        """Attend l'écriture de tous les événements d'audit en attente"""
+        self._audit_queue.flush()
+    
+    def _write_audit(self, events: List[Tuple[str, Dict[str, Any]]]):
+        """Écrit un lot d'événements d'audit (thread de la file d'audit)"""
+        audit = self._audit
+        if audit is None:
+            return
+        
+        for action_name, details in events:
+            try:
+                audit.log_action(ActionType[action_name], details)
+            except Exception as e:
+                print(f"[MemoryService] Audit error, event dropped: {e}", file=sys.stderr)
 
 
 # Instance globale
@@ -1,44 +1,111 @@
 import psutil
 import shutil
 import os
+import re
+import time
 import datetime
-from typing import Dict, Any
+from collections import deque
+from typing import Dict, Any, List, Optional
 from services.gpu_service import gpu_service
 
+# Durées de cache (secondes) : le remplissage disque évolue lentement,
+# la lecture NVML coûte quelques ms par appel
+DISK_CACHE_TTL = 5.0
+GPU_CACHE_TTL = 1.0
+
+# Logs répétitifs de spinner/progression à ignorer (un seul scan C par log).
+# Inclut les 10 états du spinner braille d'Ollama.
+_LOG_SKIP_RE = re.compile(r'verifying sha256|pulling manifest|[⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏]')
+
 class MonitoringService:
     def __init__(self):
         # Initialisation avec un log de bienvenue
-        self.logs = [f"INFO: HorizonAI Core System started at {datetime.datetime.now().strftime('%H:%M:%S')}"]
+        # Logs stockés en (seq, texte) : le frontend ne récupère que les logs
+        # postérieurs au dernier seq vu. On garde les 100 derniers (éviction O(1))
+        self._log_seq = 1
+        self.logs = deque(
+            [(1, f"INFO: HorizonAI Core System started at {datetime.datetime.now().strftime('%H:%M:%S')}")],
+            maxlen=100
+        )
+
+        # Le nombre de coeurs/threads ne change pas à l'exécution
+        self.cores = psutil.cpu_count(logical=False)
+        self.threads = psutil.cpu_count(logical=True)
+
+        # Empreintes des 16 derniers messages (déduplication des logs qui
+        # alternent, ex: états de progression entrelacés d'Ollama)
+        self._recent_hashes = deque(maxlen=16)
+
+        # Caches (horodatage monotonic, valeur) pour le polling frontend
+        self._disk_cache = (0.0, None)
+        self._gpu_cache = (0.0, None)
 
     def add_log(self, message: str):
         """Ajoute un log avec horodatage."""
         # Ignorer les logs répétitifs de spinner/progression
-        if any(skip in message for skip in ['verifying sha256', 'pulling manifest', '⠋', '⠙', '⠹']):
+        if _LOG_SKIP_RE.search(message):
             return
         
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        
-        # Éviter les doublons consécutifs
-        if self.logs and self.logs[-1] == log_entry:
+        # Éviter les doublons parmi les messages récents
+        message_hash = hash(message)
+        if message_hash in self._recent_hashes:
             return
+        self._recent_hashes.append(message_hash)
+        
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        self._log_seq += 1
+        self.logs.append((self._log_seq, f"[{timestamp}] {message}"))
+
+    def add_logs(self, messages: List[str]):
+        """Ajoute plusieurs logs d'un coup (un seul horodatage pour le lot)."""
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        for message in messages:
+            if _LOG_SKIP_RE.search(message):
+                continue
+            
+            message_hash = hash(message)
+            if message_hash in self._recent_hashes:
+                continue
+            self._recent_hashes.append(message_hash)
             
-        self.logs.append(log_entry)
-        # On garde les 100 derniers logs pour ne pas saturer la mémoire
-        if len(self.logs) > 100:
-            self.logs.pop(0)
+            self._log_seq += 1
+            self.logs.append((self._log_seq, f"[{timestamp}] {message}"))
 
-    def get_monitoring_info(self) -> Dict[str, Any]:
-        cpu_usage = psutil.cpu_percent(interval=None)
-        mem = psutil.virtual_memory()
+    def _get_disk_percent(self, now: float) -> float:
+        """Usage disque en %, rafraîchi au plus toutes les DISK_CACHE_TTL secondes."""
+        if self._disk_cache[1] is None or now - self._disk_cache[0] > DISK_CACHE_TTL:
+            try:
+                disk = shutil.disk_usage(os.getenv('SystemDrive', 'C:'))
+                disk_percent = round((disk.used / disk.total) * 100, 1)
+            except:
+                disk_percent = 0
+            self._disk_cache = (now, disk_percent)
+        return self._disk_cache[1]
+
+    def _get_gpu_stats(self, now: float) -> Dict[str, Any]:
+        """Stats GPU, rafraîchies au plus toutes les GPU_CACHE_TTL secondes."""
+        if self._gpu_cache[1] is None or now - self._gpu_cache[0] > GPU_CACHE_TTL:
+            self._gpu_cache = (now, gpu_service.get_gpu_stats())
+        return self._gpu_cache[1]
+
+    def get_logs_since(self, since_seq: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Retourne les logs postérieurs à since_seq.
         
-        try:
-            disk = shutil.disk_usage(os.getenv('SystemDrive', 'C:'))
-            disk_percent = round((disk.used / disk.total) * 100, 1)
-        except:
-            disk_percent = 0
+        Sans since_seq (ou si since_seq est en avance, ex: worker redémarré),
+        renvoie tous les logs conservés avec full=True.
+        """
+        if since_seq is None or since_seq > self._log_seq:
+            return {"logs": [text for _, text in self.logs], "full": True}
+        return {"logs": [text for seq, text in self.logs if seq > since_seq], "full": False}
 
-        gpu_stats = gpu_service.get_gpu_stats()
+    def get_monitoring_info(self, since_seq: Optional[int] = None) -> Dict[str, Any]:
+        now = time.monotonic()
+        cpu_usage = psutil.cpu_percent(interval=None)
+        mem = psutil.virtual_memory()
+        disk_percent = self._get_disk_percent(now)
+        gpu_stats = self._get_gpu_stats(now)
+        logs = self.get_logs_since(since_seq)
 
         return {
             "cpu": { "usage_percent": cpu_usage },
@@ -47,9 +114,11 @@ class MonitoringService:
             "vramUsed": gpu_stats["vram_used"],
             "vramTotal": gpu_stats["vram_total"],
             "disk": { "usage_percent": disk_percent },
-            "cores": psutil.cpu_count(logical=False),
-            "threads": psutil.cpu_count(logical=True),
-            "logs": self.logs  # ✅ IMPORTANT: Ta Console.jsx attend cette clé !
+            "cores": self.cores,
+            "threads": self.threads,
+            "logs": logs["logs"],  # ✅ IMPORTANT: Ta Console.jsx attend cette clé !
+            "logs_full": logs["full"],
+            "log_seq": self._log_seq
         }
 
 monitoring_service = MonitoringService()
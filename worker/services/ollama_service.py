@@ -1,27 +1,75 @@
 import subprocess
 import re
 import sys
+import time
 from typing import Generator
 from services.monitoring_service import monitoring_service # ✅ Import pour les logs
 
 # ✅ Flag pour masquer la fenêtre CMD sur Windows
 SUBPROCESS_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
 
-# Regex pour supprimer les codes ANSI et les spinners
-ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])|\[[\d;]*[A-Za-z]|\x1b\[[^\x1b]*')
+# Regex unique pour supprimer les codes ANSI (ESC + séquence) et les séquences
+# de terminal courantes restantes sans ESC ([K, [?25h/l, [?2026h/l, [1G, [A)
+CLEANUP_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])|\[(?:K|\?25[hl]|\?2026[hl]|1G|A)')
+# Pourcentage de progression (nombre suivi de %)
+PERCENT_RE = re.compile(r'(\d+)%')
+# Lignes d'animation ollama ignorées (la ligne vide est écartée avant)
+_SKIP_LINES = frozenset({'pulling manifest', 'verifying sha256 digest'})
 SPINNER_CHARS = set('⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏')
+# Table de suppression des spinners (une seule passe C via str.translate)
+_SPINNER_TABLE = str.maketrans('', '', ''.join(SPINNER_CHARS))
 
 def clean_line(line: str) -> str:
     """Nettoie les codes ANSI et les caractères de spinner"""
-    # Supprimer les codes d'échappement ANSI
-    cleaned = ANSI_ESCAPE.sub('', line)
-    # Supprimer les caractères de spinner
-    cleaned = ''.join(c for c in cleaned if c not in SPINNER_CHARS)
-    # Supprimer les séquences courantes de terminal
-    cleaned = cleaned.replace('[K', '').replace('[?25h', '').replace('[?25l', '')
-    cleaned = cleaned.replace('[?2026l', '').replace('[?2026h', '').replace('[1G', '')
-    cleaned = cleaned.replace('[A', '')
-    return cleaned.strip()
+    # Chemin rapide : pas d'ESC ni de '[' → aucune séquence terminal à retirer,
+    # on évite le regex
+    if '\x1b' not in line and '[' not in line:
+        return line.translate(_SPINNER_TABLE).strip()
+    
+    # Supprimer codes ANSI + séquences terminal (une passe), puis les spinners.
+    # strip() (et non rstrip) : le spinner retiré laisse un espace en tête
+    # ("⠋ pulling manifest") ; sans rien à retirer, il renvoie la même chaîne
+    return CLEANUP_RE.sub('', line).translate(_SPINNER_TABLE).strip()
+
+# Lot de logs envoyés au monitoring : au plus LOG_BATCH_SIZE lignes ou LOG_FLUSH_INTERVAL s
+LOG_BATCH_SIZE = 32
+LOG_FLUSH_INTERVAL = 0.2
+# Intervalle minimal (s) entre deux répétitions d'une même ligne sans pourcentage
+STATUS_REPEAT_INTERVAL = 0.25
+
+# Fin de ligne au sens "universal newlines" : CRLF, CR seul ou LF
+_LINE_END_RE = re.compile(rb'\r\n?|\n')
+
+def iter_output_lines(stream, chunk_size: int = 65536) -> Generator[bytes, None, None]:
+    """
+    Découpe la sortie binaire d'un process en lignes, par blocs de chunk_size
+    (un read() par bloc au lieu d'un par ligne).
+    
+    CR, LF et CRLF terminent une ligne (comme une lecture texte) : les trames
+    de progression d'Ollama, réécrites avec CR seul, sont émises dès leur
+    arrivée. Seuls les octets nouvellement reçus sont examinés (offset de
+    scan), le reste d'une ligne incomplète est gardé dans un bytearray.
+    """
+    buffer = bytearray()
+    skip_lf = False  # CR en fin de bloc : un LF en tête du suivant complète un CRLF
+    while True:
+        chunk = stream.read1(chunk_size)
+        if not chunk:
+            break
+        if skip_lf and chunk[:1] == b'\n':
+            chunk = chunk[1:]
+        skip_lf = False
+        scan = len(buffer)  # Le début du buffer ne contient aucune fin de ligne
+        buffer += chunk
+        start = 0
+        for match in _LINE_END_RE.finditer(buffer, scan):
+            yield bytes(buffer[start:match.start()])
+            start = match.end()
+        if start:
+            skip_lf = start == len(buffer) and buffer[-1] == 0x0D
+            del buffer[:start]
+    if buffer:
+        yield bytes(buffer)
 
 class OllamaService:
     def __init__(self, base_url="http://127.0.0.1:11434"):
@@ -30,53 +78,95 @@ class OllamaService:
     def pull_model_stream(self, model: str) -> Generator[dict, None, None]:
         monitoring_service.add_log(f"OLLAMA: Starting subprocess for {model}")
         
+        # Pipe en mode bytes : le décodage UTF-8 n'est fait que pour les lignes
+        # non vides (les trames de spinner vides sont écartées avant décodage)
         process = subprocess.Popen(
             ["ollama", "pull", model],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            bufsize=1,  # Line buffered
+            bufsize=65536,  # Lecture par blocs (voir iter_output_lines)
             creationflags=SUBPROCESS_FLAGS  # ✅ Masquer la fenêtre CMD sur Windows
         )
 
+        # Logs accumulés puis envoyés par lots (add_logs) hors de la boucle chaude
+        pending_logs = []
+        last_flush = time.monotonic()
+        
+        # Événement de progression réutilisé à chaque ligne : le consommateur
+        # (main._handle_stream) le sérialise avant le yield suivant
+        progress_event = {"event": "progress", "model": model, "message": "", "progress": None}
+        
+        # Coalescence : une trame par (couche, % entier), répétitions de statut limitées
+        last_progress_key = None
+        last_status = None
+        last_status_ts = 0.0
+
         try:
-            for line in process.stdout:
+            for raw in iter_output_lines(process.stdout):
+                # Trames vides écartées sans décodage (CR/LF déjà retirés
+                # par iter_output_lines, isspace() n'alloue rien)
+                if not raw or raw.isspace():
+                    continue
+
                 # Nettoyer les codes ANSI et spinners
-                line = clean_line(line)
+                line = clean_line(raw.decode('utf-8', 'ignore'))
                 if not line: continue
                 
                 # Ignorer les lignes de spinner/animation
-                if line in ['pulling manifest', 'verifying sha256 digest', '']:
+                if line in _SKIP_LINES:
                     continue
 
+                # Un seul scan de '%' : décide du log ET de l'extraction du pourcentage
+                has_pct = "%" in line
+
                 # On envoie la ligne nettoyée dans les logs système pour la Console.jsx
-                if "%" not in line:
-                    monitoring_service.add_log(f"OLLAMA: {line}")
+                if not has_pct:
+                    pending_logs.append(f"OLLAMA: {line}")
+
+                if pending_logs:
+                    now = time.monotonic()
+                    if len(pending_logs) >= LOG_BATCH_SIZE or now - last_flush > LOG_FLUSH_INTERVAL:
+                        monitoring_service.add_logs(pending_logs)
+                        pending_logs = []
+                        last_flush = now
 
-                # Extraire le pourcentage de progression
+                # Extraire le pourcentage de progression (\d+ : int() ne peut pas échouer)
                 percent = None
-                if "%" in line:
-                    try:
-                        # Chercher un nombre suivi de %
-                        match = re.search(r'(\d+)%', line)
-                        if match:
-                            percent = int(match.group(1))
-                    except: pass
-
-                yield {
-                    "event": "progress",
-                    "model": model,
-                    "message": line,
-                    "progress": percent
-                }
+                if has_pct:
+                    match = PERCENT_RE.search(line)
+                    if match:
+                        percent = int(match[1])
+
+                # Ollama émet de nombreuses trames par % (débit, octets) : seules
+                # les trames qui changent le % entier de la couche sont transmises
+                if percent is not None:
+                    progress_key = (line[:match.start()], percent)
+                    if progress_key == last_progress_key:
+                        continue
+                    last_progress_key = progress_key
+                else:
+                    now = time.monotonic()
+                    if line == last_status and now - last_status_ts < STATUS_REPEAT_INTERVAL:
+                        continue
+                    last_status = line
+                    last_status_ts = now
+
+                progress_event["message"] = line
+                progress_event["progress"] = percent
+                yield progress_event
             
             # ✅ Envoyer l'événement "done" AVANT de fermer le processus
+            if pending_logs:
+                monitoring_service.add_logs(pending_logs)
+                pending_logs = []
             monitoring_service.add_log(f"SUCCESS: Model {model} pulled successfully.")
             yield {"event": "done", "model": model}
             
         finally:
+            # Logs restants (interruption du stream ou erreur)
+            if pending_logs:
+                monitoring_service.add_logs(pending_logs)
+            
             # ✅ CRITIQUE: Toujours fermer et attendre le processus pour éviter les zombies
             if process.stdout:
                 process.stdout.close()
@@ -13,7 +13,98 @@ SÉCURITÉ CRITIQUE - Ne pas modifier sans review
 from pathlib import Path
 import os
 import sys
-from typing import Tuple
+import stat
+import functools
+from typing import Optional, Tuple
+
+
+def _get_forbidden_paths() -> list[Path]:
+    """Retourne les chemins système interdits selon l'OS"""
+    forbidden = []
+    
+    if sys.platform == "win32":
+        # Windows - Chemins système critiques
+        system_root = os.environ.get("SYSTEMROOT", "C:\\Windows")
+        forbidden.extend([
+            Path(system_root),
+            Path("C:\\Windows"),
+            Path("C:\\Program Files"),
+            Path("C:\\Program Files (x86)"),
+            Path("C:\\ProgramData"),
+        ])
+        
+        # AppData système (pas utilisateur)
+        # Note: AppData utilisateur est OK pour projets perso
+        system_appdata = os.environ.get("ALLUSERSPROFILE")
+        if system_appdata:
+            forbidden.append(Path(system_appdata))
+            
+    else:
+        # Unix-like (Linux/Mac) - Chemins système critiques
+        forbidden.extend([
+            Path("/etc"),
+            Path("/sys"),
+            Path("/proc"),
+            Path("/dev"),
+            Path("/bin"),
+            Path("/sbin"),
+            Path("/usr/bin"),
+            Path("/usr/sbin"),
+            Path("/boot"),
+            Path("/root"),
+            Path("/var/log"),
+        ])
+    
+    return forbidden
+
+
+def _build_forbidden_prefixes(forbidden_paths: list[Path]) -> dict:
+    """
+    Préfixes normalisés (normcase : insensible à la casse sous Windows) -> nom
+    affiché, pour un seul startswith(tuple) au lieu d'une boucle relative_to.
+    On garde la forme brute ET résolue (ex: /bin -> /usr/bin).
+    """
+    names = {}
+    for forbidden in forbidden_paths:
+        for variant in (forbidden, forbidden.resolve()):
+            prefix = os.path.normcase(os.path.join(str(variant), ''))
+            names.setdefault(prefix, forbidden.name)
+    return names
+
+
+# Calculés une seule fois à l'import (indépendants de l'instance)
+FORBIDDEN_PATHS = _get_forbidden_paths()
+_FORBIDDEN_NAMES = _build_forbidden_prefixes(FORBIDDEN_PATHS)
+_FORBIDDEN_PREFIXES = tuple(_FORBIDDEN_NAMES)
+
+# Extensions de fichiers interdites pour analyse
+FORBIDDEN_EXTENSIONS = frozenset({
+    '.exe', '.dll', '.so', '.dylib',  # Exécutables
+    '.sys', '.drv',  # Drivers système
+})
+
+
+def _forbidden_name(path_str: str) -> Optional[str]:
+    """Nom du dossier système interdit contenant path_str (chemin absolu), sinon None"""
+    path_prefix = os.path.normcase(os.path.join(path_str, ''))
+    if not path_prefix.startswith(_FORBIDDEN_PREFIXES):
+        return None
+    return next(
+        _FORBIDDEN_NAMES[prefix]
+        for prefix in _FORBIDDEN_PREFIXES
+        if path_prefix.startswith(prefix)
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _truncate(path_str: str, max_length: int) -> str:
+    """Tronque path_str au milieu (mis en cache : appelé à chaque rafraîchissement UI)"""
+    if len(path_str) <= max_length:
+        return path_str
+    
+    # Tronquer au milieu pour garder début et fin
+    half = (max_length - 3) // 2
+    return f"{path_str[:half]}...{path_str[-half:]}"
 
 
 class PathValidator:
@@ -28,53 +119,11 @@ class PathValidator:
     """
     
     def __init__(self):
-        # Chemins système interdits (détectés automatiquement selon OS)
-        self.forbidden_paths = self._get_forbidden_paths()
+        # Chemins système interdits (détectés automatiquement selon OS, à l'import)
+        self.forbidden_paths = FORBIDDEN_PATHS
         
         # Extensions de fichiers interdites pour analyse
-        self.forbidden_extensions = {
-            '.exe', '.dll', '.so', '.dylib',  # Exécutables
-            '.sys', '.drv',  # Drivers système
-        }
-    
-    def _get_forbidden_paths(self) -> list[Path]:
-        """Retourne les chemins système interdits selon l'OS"""
-        forbidden = []
-        
-        if sys.platform == "win32":
-            # Windows - Chemins système critiques
-            system_root = os.environ.get("SYSTEMROOT", "C:\\Windows")
-            forbidden.extend([
-                Path(system_root),
-                Path("C:\\Windows"),
-                Path("C:\\Program Files"),
-                Path("C:\\Program Files (x86)"),
-                Path("C:\\ProgramData"),
-            ])
-            
-            # AppData système (pas utilisateur)
-            # Note: AppData utilisateur est OK pour projets perso
-            system_appdata = os.environ.get("ALLUSERSPROFILE")
-            if system_appdata:
-                forbidden.append(Path(system_appdata))
-                
-        else:
-            # Unix-like (Linux/Mac) - Chemins système critiques
-            forbidden.extend([
-                Path("/etc"),
-                Path("/sys"),
-                Path("/proc"),
-                Path("/dev"),
-                Path("/bin"),
-                Path("/sbin"),
-                Path("/usr/bin"),
-                Path("/usr/sbin"),
-                Path("/boot"),
-                Path("/root"),
-                Path("/var/log"),
-            ])
-        
-        return forbidden
+        self.forbidden_extensions = FORBIDDEN_EXTENSIONS
     
     def is_safe_repo_path(self, path_str: str) -> Tuple[bool, str]:
         """
@@ -93,36 +142,49 @@ class PathValidator:
             >>> validator.is_safe_repo_path("../../../../../../Windows")
             (False, "Access to system directory Windows is forbidden")
         """
+        # Jamais de verdict en cache : le dossier (existence, contenu, liens
+        # symboliques) peut changer entre deux appels
         try:
             # 1. Vérifier que le chemin n'est pas vide
             if not path_str or not path_str.strip():
                 return False, "Path cannot be empty"
             
             # 2. Résoudre le chemin absolu (neutralise .. et symlinks)
-            # resolve() suit les liens symboliques et résout les chemins relatifs
+            # a) Forme normalisée sans syscall : rejet rapide des chemins système
             try:
-                path = Path(path_str).resolve(strict=False)
+                norm = os.path.normpath(os.path.abspath(path_str))
             except (OSError, ValueError) as e:
                 return False, f"Invalid path format: {str(e)}"
+            # Préfiltre profondeur sur la forme normalisée ("." et "//" ne
+            # comptent pas) avant tout stat (marge x2 : le check 8 fait foi)
+            if norm.count(os.sep) > 40:
+                return False, "Path too deep (max 20 levels)"
+            name = _forbidden_name(norm)
+            if name:
+                return False, f"Access to system directory '{name}' is forbidden for security reasons"
             
-            # 3. Vérifier existence
-            if not path.exists():
+            # b) realpath suit les liens symboliques (un lien sous un dossier
+            # autorisé peut pointer vers /etc) : revérifié à l'étape 5
+            try:
+                path = Path(os.path.realpath(norm))
+            except (OSError, ValueError) as e:
+                return False, f"Invalid path format: {str(e)}"
+            
+            # 3. Vérifier existence (un seul stat pour existence + type)
+            try:
+                st = os.stat(path)
+            except (OSError, ValueError):
                 return False, "Path does not exist"
             
             # 4. Vérifier que c'est un dossier
-            if not path.is_dir():
+            if not stat.S_ISDIR(st.st_mode):
                 return False, "Path must be a directory"
             
             # 5. Vérifier chemins système interdits
-            for forbidden in self.forbidden_paths:
-                try:
-                    # Si path est sous-dossier de forbidden → interdit
-                    # relative_to() lève ValueError si path n'est pas sous forbidden
-                    path.relative_to(forbidden)
-                    return False, f"Access to system directory '{forbidden.name}' is forbidden for security reasons"
-                except ValueError:
-                    # path n'est pas dans forbidden, continuer
-                    pass
+            # Si path est (sous-dossier de) forbidden → interdit
+            name = _forbidden_name(str(path))
+            if name:
+                return False, f"Access to system directory '{name}' is forbidden for security reasons"
             
             # 6. Vérifier permissions lecture
             if not os.access(path, os.R_OK):
@@ -130,10 +192,10 @@ class PathValidator:
             
             # 7. Vérifier que le dossier n'est pas vide (évite erreurs analyse)
             try:
-                # Tenter de lister au moins 1 fichier
-                next(path.iterdir())
-            except StopIteration:
-                return False, "Directory is empty"
+                # Tenter de lister au moins 1 entrée (DirEntry léger, handle fermé)
+                with os.scandir(path) as entries:
+                    if next(entries, None) is None:
+                        return False, "Directory is empty"
             except PermissionError:
                 return False, "Permission denied to list directory contents"
             
@@ -165,12 +227,7 @@ class PathValidator:
         Returns:
             Chemin tronqué pour affichage
         """
-        if len(path_str) <= max_length:
-            return path_str
-        
-        # Tronquer au milieu pour garder début et fin
-        half = (max_length - 3) // 2
-        return f"{path_str[:half]}...{path_str[-half:]}"
+        return _truncate(path_str, max_length)
 
 
 # Singleton global (pattern standard des services)
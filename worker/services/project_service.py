@@ -13,26 +13,94 @@ import os
 import sys
 import json
 import uuid
+import atexit
+import functools
+import operator
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-# Import des services
+from services.background_queue import BackgroundQueue
+
+# Services liés (mémoire, historique, audit, crypto) : importés au premier
+# usage (voir ProjectService._memory/_chat/crypto_service et _log_audit),
+# pas à l'import de ce module
+
+# Sérialisation JSON : orjson (C, sérialise directement les dataclasses, sortie
+# bytes) si disponible, sinon stdlib json via Project.to_dict().
+# Sortie compacte par défaut (fichier écrit par la machine) ; indentée
+# uniquement si HORIZON_PRETTY_JSON est défini (debug)
 try:
-    from services.memory_service import memory_service
-    from services.chat_history_service import chat_history_service
-    from services.audit_service import audit_service, ActionType
-    SERVICES_AVAILABLE = True
+    import orjson
 except ImportError:
-    SERVICES_AVAILABLE = False
-    memory_service = None
-    chat_history_service = None
-    audit_service = None
-    ActionType = None
+    orjson = None
+
+PRETTY_JSON = bool(os.environ.get("HORIZON_PRETTY_JSON"))
+
+if orjson is not None:
+    _DUMPS_OPTIONS = orjson.OPT_SERIALIZE_DATACLASS | (orjson.OPT_INDENT_2 if PRETTY_JSON else 0)
+    
+    def _dumps(data: Any) -> bytes:
+        return orjson.dumps(data, option=_DUMPS_OPTIONS)
+    _loads = orjson.loads
+else:
+    def _dumps(data: Any) -> bytes:
+        if PRETTY_JSON:
+            text = json.dumps(data, indent=2, ensure_ascii=False, default=lambda o: o.to_dict())
+        else:
+            text = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=lambda o: o.to_dict())
+        return text.encode("utf-8")
+    _loads = json.loads
+
+# Délai (secondes) avant l'écriture groupée des lastAccessedAt modifiés par get_project
+TOUCH_FLUSH_DELAY = 3.0
+# Taille max du journal des lastAccessedAt avant repli dans projects.json
+TOUCH_LOG_MAX_ENTRIES = 256
+
+def _log_audit(actions: List[Tuple[str, Dict[str, Any]]]):
+    """Écrit un lot d'actions d'audit (thread de _audit_queue, import au premier usage)"""
+    try:
+        from services.audit_service import audit_service, ActionType
+    except ImportError:
+        return
+    for action_name, details in actions:
+        try:
+            audit_service.log_action(ActionType[action_name], details)
+        except Exception as e:
+            print(f"[ProjectService] Error logging, action dropped: {e}", file=sys.stderr)
+
+
+# Audit en arrière-plan : un seul thread, les actions restent ordonnées et
+# celles en attente sont écrites à la sortie de l'interpréteur
+_audit_queue = BackgroundQueue("project-audit", _log_audit)
+
+
+def _submit_audit(action_name: str, details: Dict[str, Any]):
+    """Programme une action d'audit (nom d'ActionType) sans bloquer l'appelant"""
+    _audit_queue.put((action_name, details))
+
+
+# Clé de tri des projets (plus récent en premier dans list_projects)
+_BY_LAST_ACCESS = operator.attrgetter("lastAccessedAt")
+
 
+def _locked(method):
+    """Exécute la méthode sous self._lock (lecture-modification-écriture atomique)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
-@dataclass
+
+def _utcnow_iso() -> str:
+    """Horodatage UTC ISO (calculé une fois par opération, puis réutilisé)"""
+    return datetime.utcnow().isoformat()
+
+
+@dataclass(slots=True)
 class ProjectRepo:
     """Repository attaché à un projet"""
     path: str
@@ -40,7 +108,7 @@ class ProjectRepo:
     analysis: Optional[Dict[str, Any]] = None  # Cache de l'analyse
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectPermissions:
     """Permissions d'un projet"""
     read: bool = True
@@ -48,7 +116,7 @@ class ProjectPermissions:
     custom: Optional[Dict[str, bool]] = None  # Permissions custom par projet
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectSettings:
     """Paramètres d'un projet"""
     defaultModel: Optional[str] = None
@@ -56,22 +124,22 @@ class ProjectSettings:
     contextMode: str = 'safe'  # 'safe' | 'standard'
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class Project:
     """Structure d'un projet V2.1"""
-    id: str  # UUID v4
+    id: str  # UUID v4 (hex sans tirets ; les anciens ids avec tirets restent valides)
     name: str
     description: Optional[str] = None
     scopePath: Optional[str] = None  # Dossier de travail (peut être null)
     
     # Repos (peut avoir plusieurs repos)
-    repos: List[ProjectRepo] = None
+    repos: List[ProjectRepo] = field(default_factory=list)
     
     # Mémoire projet
-    memoryKeys: List[str] = None  # Clés mémoire de type "project" liées
+    memoryKeys: List[str] = field(default_factory=list)  # Clés mémoire de type "project" liées
     
     # Permissions
-    permissions: ProjectPermissions = None
+    permissions: ProjectPermissions = field(default_factory=ProjectPermissions)
     
     # Métadonnées
     createdAt: str = ""  # ISO date
@@ -79,39 +147,35 @@ class Project:
     lastAccessedAt: str = ""  # ISO date
     
     # Config projet
-    settings: ProjectSettings = None
+    settings: ProjectSettings = field(default_factory=ProjectSettings)
     
     # Compteur conversations (calculé dynamiquement)
     conversationCount: int = 0
     
     def __post_init__(self):
-        """Initialisation par défaut"""
+        """Initialisation par défaut (listes et sous-objets : default_factory)"""
         if not self.id:
-            self.id = str(uuid.uuid4())
-        
-        if not self.repos:
-            self.repos = []
-        
-        if not self.memoryKeys:
-            self.memoryKeys = []
-        
-        if not self.permissions:
-            self.permissions = ProjectPermissions()
-        
-        if not self.settings:
-            self.settings = ProjectSettings()
-        
-        if not self.createdAt:
-            self.createdAt = datetime.utcnow().isoformat()
-        
-        if not self.updatedAt:
-            self.updatedAt = datetime.utcnow().isoformat()
-        
-        if not self.lastAccessedAt:
-            self.lastAccessedAt = datetime.utcnow().isoformat()
+            self.id = uuid.uuid4().hex
+        
+        # Un seul horodatage pour tous les champs manquants (pas de
+        # default_factory : trois appels donneraient trois valeurs distinctes)
+        if not (self.createdAt and self.updatedAt and self.lastAccessedAt):
+            now = _utcnow_iso()
+            if not self.createdAt:
+                self.createdAt = now
+            if not self.updatedAt:
+                self.updatedAt = now
+            if not self.lastAccessedAt:
+                self.lastAccessedAt = now
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convertit le projet en dictionnaire pour JSON"""
+        """
+        Convertit le projet en dictionnaire pour JSON
+        
+        Réservé aux réponses IPC et au fallback stdlib : avec orjson, la
+        sauvegarde sérialise directement les dataclasses sans passer par ici.
+        """
+        repos = self.repos
         return {
             "id": self.id,
             "name": self.name,
@@ -122,8 +186,8 @@ class Project:
                     "path": repo.path,
                     "attachedAt": repo.attachedAt,
                     "analysis": repo.analysis
-                } for repo in self.repos
-            ],
+                } for repo in repos
+            ] if repos else [],
             "memoryKeys": self.memoryKeys,
             "permissions": {
                 "read": self.permissions.read,
@@ -143,46 +207,54 @@ class Project:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Project':
-        """Crée un projet depuis un dictionnaire"""
-        # Gérer les repos
+        """
+        Crée un projet depuis un dictionnaire
+        
+        Appelé une fois par projet à chaque (re)lecture de projects.json :
+        accès via get lié localement et sous-objets construits par position.
+        """
+        get = data.get
+        
+        # Gérer les repos (horodatage par défaut calculé au plus une fois)
         repos = []
-        if data.get("repos"):
-            for repo_data in data["repos"]:
-                repos.append(ProjectRepo(
-                    path=repo_data["path"],
-                    attachedAt=repo_data.get("attachedAt", datetime.utcnow().isoformat()),
-                    analysis=repo_data.get("analysis")
-                ))
+        now = None
+        for repo_data in get("repos") or ():
+            attached_at = repo_data.get("attachedAt")
+            if attached_at is None:
+                now = now or _utcnow_iso()
+                attached_at = now
+            repos.append(ProjectRepo(repo_data["path"], attached_at, repo_data.get("analysis")))
         
         # Gérer les permissions
-        perms_data = data.get("permissions", {})
+        perms_data = get("permissions", {})
         permissions = ProjectPermissions(
-            read=perms_data.get("read", True),
-            write=perms_data.get("write", False),
-            custom=perms_data.get("custom")
+            perms_data.get("read", True),
+            perms_data.get("write", False),
+            perms_data.get("custom")
         )
         
         # Gérer les settings
-        settings_data = data.get("settings", {})
+        settings_data = get("settings", {})
         settings = ProjectSettings(
-            defaultModel=settings_data.get("defaultModel"),
-            autoLoadRepo=settings_data.get("autoLoadRepo", True),
-            contextMode=settings_data.get("contextMode", "safe")
+            settings_data.get("defaultModel"),
+            settings_data.get("autoLoadRepo", True),
+            settings_data.get("contextMode", "safe")
         )
         
         return cls(
             id=data["id"],
             name=data["name"],
-            description=data.get("description"),
-            scopePath=data.get("scopePath"),
+            description=get("description"),
+            scopePath=get("scopePath"),
             repos=repos,
-            memoryKeys=data.get("memoryKeys", []),
+            memoryKeys=get("memoryKeys") or [],
             permissions=permissions,
-            createdAt=data.get("createdAt", datetime.utcnow().isoformat()),
-            updatedAt=data.get("updatedAt", datetime.utcnow().isoformat()),
-            lastAccessedAt=data.get("lastAccessedAt", datetime.utcnow().isoformat()),
+            # Champs absents : complétés par __post_init__ (un seul horodatage)
+            createdAt=get("createdAt", ""),
+            updatedAt=get("updatedAt", ""),
+            lastAccessedAt=get("lastAccessedAt", ""),
             settings=settings,
-            conversationCount=data.get("conversationCount", 0)
+            conversationCount=get("conversationCount", 0)
         )
 
 
@@ -209,12 +281,49 @@ class ProjectService:
         self.projects_dir.mkdir(parents=True, exist_ok=True)
         self.projects_file = self.projects_dir / "projects.json"
         
-        # Service de chiffrement (optionnel)
+        # Verrou unique (réentrant) : cache, journal des accès, et toute
+        # séquence lecture-modification-écriture (méthodes @_locked, flush)
+        self._lock = threading.RLock()
+        # Cache des projets parsés, validé par (mtime_ns, taille) du fichier,
+        # avec un index id -> Project pour les recherches en O(1)
+        self._cache_list: Optional[List[Project]] = None
+        self._cache_by_id: Dict[str, Project] = {}
+        self._cache_stat: Optional[Tuple[int, int]] = None
+        
+        # lastAccessedAt en attente d'écriture (id -> horodatage), écrits en un
+        # seul save TOUCH_FLUSH_DELAY secondes après le premier accès
+        self._touch_lock = threading.Lock()
+        self._dirty_touches: Dict[str, str] = {}
+        self._touch_timer: Optional[threading.Timer] = None
+        self._touch_log_entries = 0
+        atexit.register(self.flush)
+    
+    @functools.cached_property
+    def crypto_service(self):
+        """Service de chiffrement (optionnel), importé au premier usage"""
         try:
             from services.crypto_service import crypto_service
-            self.crypto_service = crypto_service
+            return crypto_service
         except ImportError:
-            self.crypto_service = None
+            return None
+    
+    @functools.cached_property
+    def _memory(self):
+        """memory_service, importé au premier usage (None si indisponible)"""
+        try:
+            from services.memory_service import memory_service
+            return memory_service
+        except ImportError:
+            return None
+    
+    @functools.cached_property
+    def _chat(self):
+        """chat_history_service, importé au premier usage (None si indisponible)"""
+        try:
+            from services.chat_history_service import chat_history_service
+            return chat_history_service
+        except ImportError:
+            return None
     
     def list_projects(self) -> List[Project]:
         """
@@ -225,18 +334,21 @@ class ProjectService:
         """
         projects = self._load_projects()
         
-        # Calculer conversationCount pour chaque projet
-        if SERVICES_AVAILABLE and chat_history_service:
-            for project in projects:
-                try:
-                    count = chat_history_service.get_conversation_count_by_project(project.id)
-                    project.conversationCount = count
-                except Exception as e:
-                    print(f"[ProjectService] Error counting conversations: {e}", file=sys.stderr)
-                    project.conversationCount = 0
+        # Calculer conversationCount pour chaque projet (une seule lecture de
+        # l'historique via l'API groupée si disponible)
+        if self._chat:
+            get_counts = getattr(self._chat, "get_conversation_counts", None)
+            if get_counts:
+                counts = get_counts([p.id for p in projects])
+                for project in projects:
+                    project.conversationCount = counts.get(project.id, 0)
+            else:
+                for project in projects:
+                    self._refresh_conversation_count(project)
         
-        # Trier par lastAccessedAt (plus récent en premier)
-        projects.sort(key=lambda p: p.lastAccessedAt, reverse=True)
+        # Trier par lastAccessedAt (plus récent en premier). attrgetter (C)
+        # plutôt qu'une lambda ; le cache étant déjà trié, le tri est quasi linéaire
+        projects.sort(key=_BY_LAST_ACCESS, reverse=True)
         
         return projects
     
@@ -250,16 +362,154 @@ class ProjectService:
         Returns:
             Projet ou None si non trouvé
         """
-        projects = self.list_projects()
-        project = next((p for p in projects if p.id == project_id), None)
+        _, project = self._get_project_no_touch(project_id)
         
-        # Mettre à jour lastAccessedAt
         if project:
-            project.lastAccessedAt = datetime.utcnow().isoformat()
-            self.update_project(project_id, {"lastAccessedAt": project.lastAccessedAt})
+            # conversationCount calculé pour ce seul projet (pas toute la liste)
+            self._refresh_conversation_count(project)
+            
+            # Mettre à jour lastAccessedAt (en mémoire, écriture différée)
+            self._touch(project)
+        
+        return project
+    
+    def _touch(self, project: Project):
+        """
+        Met à jour lastAccessedAt en mémoire et programme une écriture groupée
+        (une lecture ne déclenche plus une réécriture complète du fichier)
+        """
+        project.lastAccessedAt = _utcnow_iso()
+        with self._touch_lock:
+            self._dirty_touches[project.id] = project.lastAccessedAt
+            if self._touch_timer is None:
+                self._touch_timer = threading.Timer(TOUCH_FLUSH_DELAY, self.flush)
+                self._touch_timer.daemon = True
+                self._touch_timer.start()
+    
+    @_locked
+    def flush(self):
+        """
+        Écrit les lastAccessedAt en attente (appelé par le timer et à la fermeture)
+        
+        Sous self._lock : une sauvegarde concurrente (create_project,
+        delete_project...) ne peut pas être écrasée par une liste périmée.
+        """
+        with self._touch_lock:
+            touches = self._dirty_touches
+            self._dirty_touches = {}
+            if self._touch_timer is not None:
+                self._touch_timer.cancel()
+                self._touch_timer = None
+        
+        if not touches:
+            return
+        
+        try:
+            projects, by_id = self._load_index()
+            entries = []
+            for project_id, accessed_at in touches.items():
+                project = by_id.get(project_id)
+                if project is None:
+                    continue  # Projet supprimé entre-temps
+                # Le cache a pu être rechargé depuis le disque entre-temps
+                if project.lastAccessedAt < accessed_at:
+                    project.lastAccessedAt = accessed_at
+                entries.append({"id": project_id, "ts": accessed_at})
+            
+            if not entries:
+                return
+            
+            if self._touch_log_entries + len(entries) > TOUCH_LOG_MAX_ENTRIES:
+                # Journal trop long : le replier dans projects.json (qui le vide)
+                self._save_projects(projects)
+            else:
+                self._append_touches(entries)
+        except Exception as e:
+            print(f"[ProjectService] Error flushing access times: {e}", file=sys.stderr)
+    
+    @property
+    def touches_file(self) -> Path:
+        """Journal des lastAccessedAt (NDJSON, ajout seul), à côté de projects.json"""
+        return self.projects_file.with_name("projects.touches.ndjson")
+    
+    def _append_touches(self, entries: List[Dict[str, str]]):
+        """
+        Ajoute des lastAccessedAt au journal, sans réécrire ni rechiffrer
+        projects.json (une ligne chiffrée par entrée si crypto disponible)
+        """
+        crypto = self.crypto_service if self.crypto_service and self.crypto_service._master_key else None
+        lines = []
+        for entry in entries:
+            line = _dumps(entry).replace(b"\n", b"")
+            if crypto:
+                line = b"ENC:" + crypto.encrypt(line)
+            lines.append(line + b"\n")
+        
+        with open(self.touches_file, 'ab') as f:
+            f.write(b"".join(lines))
+        self._touch_log_entries += len(lines)
+    
+    def _replay_touches(self, projects: List[Project]):
+        """Réapplique le journal des lastAccessedAt sur des projets lus depuis le disque"""
+        self._touch_log_entries = 0
+        try:
+            with open(self.touches_file, 'rb') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        
+        by_id = {p.id: p for p in projects}
+        crypto = self.crypto_service if self.crypto_service and self.crypto_service._master_key else None
+        for line in lines:
+            try:
+                if line.startswith(b"ENC:"):
+                    if not crypto:
+                        continue
+                    line = crypto.decrypt(line[4:])
+                entry = _loads(line)
+                project = by_id.get(entry["id"])
+                if project and project.lastAccessedAt < entry["ts"]:
+                    project.lastAccessedAt = entry["ts"]
+                self._touch_log_entries += 1
+            except Exception:
+                continue  # Ligne tronquée (crash pendant l'ajout) : ignorée
+    
+    def _clear_touches(self):
+        """Vide le journal des lastAccessedAt (repliés dans projects.json)"""
+        try:
+            self.touches_file.unlink()
+        except FileNotFoundError:
+            pass
+        self._touch_log_entries = 0
+    
+    def _get_project_no_touch(self, project_id: str) -> Tuple[List[Project], Optional[Project]]:
+        """Liste des projets + projet demandé, sans toucher lastAccessedAt ni sauvegarder"""
+        projects, by_id = self._load_index()
+        return projects, by_id.get(project_id)
+    
+    def _refresh_conversation_count(self, project: Project):
+        """Met à jour conversationCount d'un projet depuis l'historique des conversations"""
+        if self._chat:
+            try:
+                project.conversationCount = self._chat.get_conversation_count_by_project(project.id)
+            except Exception as e:
+                print(f"[ProjectService] Error counting conversations: {e}", file=sys.stderr)
+                project.conversationCount = 0
+    
+    def _persist_project_change(self, projects: List[Project], project: Project, now: str) -> Project:
+        """
+        Sauvegarde unique après mutation en place d'un projet
         
+        Met à jour updatedAt et lastAccessedAt (l'accès était auparavant
+        enregistré par un get_project préalable, donc une écriture en plus).
+        """
+        project.updatedAt = now
+        project.lastAccessedAt = now
+        self._refresh_conversation_count(project)
+        self._save_projects(projects, now)
         return project
     
+    @_locked
     def create_project(
         self,
         name: str,
@@ -279,9 +529,11 @@ class ProjectService:
         Returns:
             Projet créé
         """
+        now = _utcnow_iso()
+        
         # Créer le projet
         project = Project(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             name=name,
             description=description,
             scopePath=scopePath,
@@ -292,33 +544,30 @@ class ProjectService:
                 write=permissions.get("write", False) if permissions else False,
                 custom=permissions.get("custom") if permissions else None
             ),
-            createdAt=datetime.utcnow().isoformat(),
-            updatedAt=datetime.utcnow().isoformat(),
-            lastAccessedAt=datetime.utcnow().isoformat()
+            createdAt=now,
+            updatedAt=now,
+            lastAccessedAt=now
         )
         
         # Sauvegarder
         projects = self._load_projects()
         projects.append(project)
-        self._save_projects(projects)
-        
-        # Logger dans audit
-        if SERVICES_AVAILABLE and audit_service and ActionType:
-            try:
-                audit_service.log_action(
-                    ActionType.PERMISSION_GRANTED,
-                    {
-                        "action": "project_created",
-                        "project_id": project.id,
-                        "project_name": project.name,
-                        "scopePath": project.scopePath
-                    }
-                )
-            except Exception as e:
-                print(f"[ProjectService] Error logging: {e}", file=sys.stderr)
+        self._save_projects(projects, now)
+        
+        # Logger dans audit (hors du chemin critique)
+        _submit_audit(
+            "PERMISSION_GRANTED",
+            {
+                "action": "project_created",
+                "project_id": project.id,
+                "project_name": project.name,
+                "scopePath": project.scopePath
+            }
+        )
         
         return project
     
+    @_locked
     def update_project(self, project_id: str, updates: Dict[str, Any]) -> Optional[Project]:
         """
         Met à jour un projet
@@ -330,12 +579,14 @@ class ProjectService:
         Returns:
             Projet mis à jour ou None si non trouvé
         """
-        projects = self._load_projects()
-        project = next((p for p in projects if p.id == project_id), None)
+        projects, by_id = self._load_index()
+        project = by_id.get(project_id)
         
         if not project:
             return None
         
+        now = _utcnow_iso()
+        
         # Mettre à jour les champs
         if "name" in updates:
             project.name = updates["name"]
@@ -349,7 +600,7 @@ class ProjectService:
             project.repos = [
                 ProjectRepo(
                     path=repo_data["path"],
-                    attachedAt=repo_data.get("attachedAt", datetime.utcnow().isoformat()),
+                    attachedAt=repo_data.get("attachedAt", now),
                     analysis=repo_data.get("analysis")
                 ) for repo_data in repos_data
             ]
@@ -372,13 +623,14 @@ class ProjectService:
         if "lastAccessedAt" in updates:
             project.lastAccessedAt = updates["lastAccessedAt"]
         
-        project.updatedAt = datetime.utcnow().isoformat()
+        project.updatedAt = now
         
         # Sauvegarder
-        self._save_projects(projects)
+        self._save_projects(projects, now)
         
         return project
     
+    @_locked
     def add_repo_to_project(self, project_id: str, repo_path: str, analysis: Optional[Dict[str, Any]] = None) -> Optional[Project]:
         """
         Ajoute un repository à un projet
@@ -391,37 +643,31 @@ class ProjectService:
         Returns:
             Projet mis à jour ou None
         """
-        project = self.get_project(project_id)
+        projects, project = self._get_project_no_touch(project_id)
         if not project:
             return None
         
+        now = _utcnow_iso()
+        
         # Vérifier si le repo existe déjà
         existing_repo = next((r for r in project.repos if r.path == repo_path), None)
         if existing_repo:
             # Mettre à jour l'analyse si fournie
             if analysis:
                 existing_repo.analysis = analysis
-                existing_repo.attachedAt = datetime.utcnow().isoformat()
+                existing_repo.attachedAt = now
         else:
             # Ajouter le nouveau repo
             project.repos.append(ProjectRepo(
                 path=repo_path,
-                attachedAt=datetime.utcnow().isoformat(),
+                attachedAt=now,
                 analysis=analysis
             ))
         
-        # Sauvegarder via update_project (qui gère la conversion)
-        updates = {
-            "repos": [
-                {
-                    "path": r.path,
-                    "attachedAt": r.attachedAt,
-                    "analysis": r.analysis
-                } for r in project.repos
-            ]
-        }
-        return self.update_project(project_id, updates)
+        # Une seule sauvegarde (plus d'aller-retour via update_project)
+        return self._persist_project_change(projects, project, now)
     
+    @_locked
     def remove_repo_from_project(self, project_id: str, repo_path: str) -> Optional[Project]:
         """
         Retire un repository d'un projet
@@ -433,25 +679,16 @@ class ProjectService:
         Returns:
             Projet mis à jour ou None
         """
-        project = self.get_project(project_id)
+        projects, project = self._get_project_no_touch(project_id)
         if not project:
             return None
         
         # Retirer le repo
         project.repos = [r for r in project.repos if r.path != repo_path]
         
-        # Sauvegarder via update_project (qui gère la conversion)
-        updates = {
-            "repos": [
-                {
-                    "path": r.path,
-                    "attachedAt": r.attachedAt,
-                    "analysis": r.analysis
-                } for r in project.repos
-            ]
-        }
-        return self.update_project(project_id, updates)
+        return self._persist_project_change(projects, project, _utcnow_iso())
     
+    @_locked
     def add_memory_key_to_project(self, project_id: str, memory_key: str) -> Optional[Project]:
         """
         Ajoute une clé mémoire à un projet
@@ -463,18 +700,16 @@ class ProjectService:
         Returns:
             Projet mis à jour ou None
         """
-        project = self.get_project(project_id)
+        projects, project = self._get_project_no_touch(project_id)
         if not project:
             return None
         
         if memory_key not in project.memoryKeys:
             project.memoryKeys.append(memory_key)
         
-        updates = {
-            "memoryKeys": project.memoryKeys
-        }
-        return self.update_project(project_id, updates)
+        return self._persist_project_change(projects, project, _utcnow_iso())
     
+    @_locked
     def remove_memory_key_from_project(self, project_id: str, memory_key: str) -> Optional[Project]:
         """
         Retire une clé mémoire d'un projet
@@ -486,17 +721,15 @@ class ProjectService:
         Returns:
             Projet mis à jour ou None
         """
-        project = self.get_project(project_id)
+        projects, project = self._get_project_no_touch(project_id)
         if not project:
             return None
         
         project.memoryKeys = [k for k in project.memoryKeys if k != memory_key]
         
-        updates = {
-            "memoryKeys": project.memoryKeys
-        }
-        return self.update_project(project_id, updates)
+        return self._persist_project_change(projects, project, _utcnow_iso())
     
+    @_locked
     def delete_project(self, project_id: str) -> bool:
         """
         Supprime un projet et ses données associées
@@ -507,43 +740,45 @@ class ProjectService:
         Returns:
             True si supprimé, False sinon
         """
-        projects = self._load_projects()
-        project = next((p for p in projects if p.id == project_id), None)
+        projects, by_id = self._load_index()
+        project = by_id.get(project_id)
         
         if not project:
             return False
         
         # Supprimer la mémoire projet (si service disponible)
-        if SERVICES_AVAILABLE and memory_service:
+        memory_service = self._memory
+        if memory_service:
             try:
                 # Supprimer toutes les entrées de mémoire du projet (via le fichier complet)
                 memory_file = memory_service.projects_dir / f"{project_id}.json"
+                bulk_deleted = True  # Pas de fichier : aucune entrée à supprimer
                 if memory_file.exists():
                     try:
                         memory_file.unlink()  # Supprimer le fichier complet
                     except Exception as e:
+                        bulk_deleted = False
                         print(f"[ProjectService] Error deleting memory file: {e}", file=sys.stderr)
                 
-                # Supprimer également chaque clé individuellement (nettoyage supplémentaire)
-                for memory_key in project.memoryKeys:
-                    try:
-                        memory_service.delete_memory("project", memory_key, project_id=project_id)
-                    except Exception:
-                        pass  # Ignorer si déjà supprimé
+                # Repli clé par clé seulement si le fichier n'a pas pu être supprimé
+                # (sinon chaque appel relirait/réécrirait un store déjà vide)
+                if not bulk_deleted:
+                    for memory_key in project.memoryKeys:
+                        try:
+                            memory_service.delete_memory("project", memory_key, project_id=project_id)
+                        except Exception:
+                            pass  # Ignorer si déjà supprimé
             except Exception as e:
                 print(f"[ProjectService] Error deleting memory: {e}", file=sys.stderr)
         
         # Marquer les conversations comme orphelines (projectId = null) OU les déplacer vers projet "Orphelin"
         # V2.1 Sprint 2.2 : Optionnellement déplacer vers projet "Orphelin" automatique
         # Pour l'instant, on marque simplement comme orphelines (projectId = null)
-        if SERVICES_AVAILABLE and chat_history_service:
+        if self._chat:
             try:
-                # Récupérer toutes les conversations du projet
-                conversations = chat_history_service.list_conversations_by_project(project_id)
-                for conv in conversations:
-                    # Marquer comme orpheline (projectId = null)
-                    # TODO V2.1 Sprint 2.2 Optionnel : Déplacer vers projet "Orphelin" au lieu de null
-                    chat_history_service.update_conversation_project(conv.get("id"), None)
+                # Marquer comme orphelines (projectId = null), en une passe sur l'historique
+                # TODO V2.1 Sprint 2.2 Optionnel : Déplacer vers projet "Orphelin" au lieu de null
+                self._chat.detach_project_conversations(project_id)
             except Exception as e:
                 print(f"[ProjectService] Error updating conversations: {e}", file=sys.stderr)
         
@@ -551,58 +786,105 @@ class ProjectService:
         projects = [p for p in projects if p.id != project_id]
         self._save_projects(projects)
         
-        # Logger dans audit
-        if SERVICES_AVAILABLE and audit_service and ActionType:
-            try:
-                audit_service.log_action(
-                    ActionType.PERMISSION_DENIED,
-                    {
-                        "action": "project_deleted",
-                        "project_id": project_id,
-                        "project_name": project.name
-                    }
-                )
-            except Exception as e:
-                print(f"[ProjectService] Error logging: {e}", file=sys.stderr)
+        # Logger dans audit (hors du chemin critique)
+        _submit_audit(
+            "PERMISSION_DENIED",
+            {
+                "action": "project_deleted",
+                "project_id": project_id,
+                "project_name": project.name
+            }
+        )
         
         return True
     
     def _load_projects(self) -> List[Project]:
-        """Charge les projets depuis le fichier"""
-        if not self.projects_file.exists():
-            return []
+        """
+        Charge les projets (cache mémoire invalidé par mtime/taille du fichier)
         
+        Returns:
+            Nouvelle liste (copie superficielle du cache : les objets Project
+            sont partagés, la liste peut être modifiée librement)
+        """
+        return self._load_index()[0]
+    
+    def _load_index(self) -> Tuple[List[Project], Dict[str, Project]]:
+        """
+        Charge les projets et l'index par id (voir _load_projects)
+        
+        Returns:
+            (copie de la liste, index id -> Project en lecture seule)
+        """
+        with self._lock:
+            try:
+                st = os.stat(self.projects_file)
+            except OSError:
+                self._set_cache(None)
+                return [], {}
+            
+            stat_key = (st.st_mtime_ns, st.st_size)
+            if self._cache_list is not None and self._cache_stat == stat_key:
+                return list(self._cache_list), self._cache_by_id
+            
+            projects = self._read_projects()
+            if projects is None:
+                # Erreur de lecture : pas de mise en cache (ex: clé crypto pas encore définie)
+                self._set_cache(None)
+                return [], {}
+            
+            self._set_cache(projects, stat_key)
+            return list(projects), self._cache_by_id
+    
+    def _set_cache(self, projects: Optional[List[Project]], stat_key: Optional[Tuple[int, int]] = None):
+        """Remplace le cache (liste + index par id) ; None l'invalide. Appelé sous _lock"""
+        if projects is None:
+            self._cache_list = None
+            self._cache_by_id = {}
+        else:
+            # Gardé trié par lastAccessedAt : list_projects retrie une liste
+            # presque ordonnée (timsort ~O(N)) au lieu d'une liste quelconque
+            self._cache_list = sorted(projects, key=_BY_LAST_ACCESS, reverse=True)
+            self._cache_by_id = {p.id: p for p in projects}
+        self._cache_stat = stat_key
+    
+    def _read_projects(self) -> Optional[List[Project]]:
+        """Lit et parse le fichier des projets (None si erreur)"""
         try:
-            with open(self.projects_file, 'r', encoding='utf-8') as f:
+            with open(self.projects_file, 'rb') as f:
                 content = f.read()
                 
                 # Détecter si chiffré (préfixe "ENC:")
-                if content.startswith("ENC:"):
+                if content.startswith(b"ENC:"):
                     if not self.crypto_service or not self.crypto_service._master_key:
                         print("[ProjectService] Encrypted file but no crypto key, returning empty", file=sys.stderr)
-                        return []
+                        return None
                     
-                    encrypted_data = content[4:]  # Enlever "ENC:"
                     try:
-                        decrypted = self.crypto_service.decrypt_string(encrypted_data)
-                        data = json.loads(decrypted)
+                        # API bytes : pas de décodage/ré-encodage UTF-8 du blob,
+                        # memoryview évite la copie du slice "ENC:"
+                        decrypted = self.crypto_service.decrypt(memoryview(content)[4:])
+                        data = _loads(decrypted)
                     except Exception as e:
                         print(f"[ProjectService] Error decrypting: {e}", file=sys.stderr)
-                        return []
+                        return None
                 else:
-                    # Données en clair
-                    data = json.loads(content) if content.strip() else {}
+                    # Données en clair (bytes parsés directement)
+                    data = _loads(content) if content.strip() else {}
             
             # Convertir en objets Project
             projects_data = data.get("projects", [])
             projects = [Project.from_dict(p) for p in projects_data]
             
+            # lastAccessedAt plus récents, journalisés depuis le dernier save
+            self._replay_touches(projects)
+            
             return projects
             
         except Exception as e:
             print(f"[ProjectService] Error loading projects: {e}", file=sys.stderr)
-            return []
+            return None
     
+    @_locked
     def get_or_create_orphan_project(self, language: str = "fr") -> Project:
         """
         Récupère ou crée le projet "Orphelin" automatique pour conversations sans projet (V2.1 Sprint 2.2)
@@ -643,28 +925,59 @@ class ProjectService:
         
         return orphan_project
     
-    def _save_projects(self, projects: List[Project]):
-        """Sauvegarde les projets dans le fichier (chiffré si crypto disponible)"""
+    def _save_projects(self, projects: List[Project], now: Optional[str] = None):
+        """
+        Sauvegarde les projets dans le fichier (chiffré si crypto disponible)
+        
+        Args:
+            projects: Liste complète des projets
+            now: Horodatage de l'opération appelante (réutilisé pour last_updated)
+        """
         try:
+            # Les objets Project sont sérialisés tels quels (pas de to_dict intermédiaire)
             data = {
-                "projects": [p.to_dict() for p in projects],
-                "last_updated": datetime.utcnow().isoformat(),
+                "projects": projects,
+                "last_updated": now or _utcnow_iso(),
                 "version": "2.1"
             }
             
-            json_data = json.dumps(data, indent=2, ensure_ascii=False)
+            json_data = _dumps(data)
             
             # Chiffrer si crypto disponible
             if self.crypto_service and self.crypto_service._master_key:
                 try:
-                    encrypted = self.crypto_service.encrypt_string(json_data)
-                    json_data = "ENC:" + encrypted
+                    json_data = b"ENC:" + self.crypto_service.encrypt(json_data)
                 except Exception as e:
                     print(f"[ProjectService] Error encrypting: {e}", file=sys.stderr)
             
-            # Écrire dans le fichier
-            with open(self.projects_file, 'w', encoding='utf-8') as f:
-                f.write(json_data)
+            with self._lock:
+                # Invalider d'abord : si l'écriture échoue, le cache ne doit pas
+                # refléter des données qui ne sont pas sur disque
+                self._set_cache(None)
+                
+                # Écriture atomique (binaire : pas de ré-encodage UTF-8) : fichier
+                # temporaire + os.replace, pour qu'un crash en cours d'écriture ne
+                # laisse jamais un projects.json tronqué (relu comme liste vide)
+                tmp_path = self.projects_file.with_suffix(self.projects_file.suffix + ".tmp")
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        f.write(json_data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.projects_file)
+                except Exception:
+                    try:
+                        tmp_path.unlink()
+                    except OSError:
+                        pass
+                    raise
+                
+                # Le cache reprend directement la liste sauvegardée (pas de relecture)
+                st = os.stat(self.projects_file)
+                self._set_cache(projects, (st.st_mtime_ns, st.st_size))
+                
+                # projects.json contient désormais tous les lastAccessedAt
+                self._clear_touches()
                 
         except Exception as e:
             print(f"[ProjectService] Error saving projects: {e}", file=sys.stderr)
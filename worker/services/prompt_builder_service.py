@@ -9,17 +9,89 @@ IMPORTANT - Philosophie LOCAL-FIRST:
 - Versioning pour traçabilité
 """
 
+import io
 import os
 import sys
 import json
 import uuid
+import functools
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
+from services.background_queue import BackgroundQueue
 
-@dataclass
+# Sérialisation JSON du log d'audit : orjson (C, sortie bytes) si disponible,
+# sinon encodeur C compact de la stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps = orjson.dumps
+else:
+    def _dumps(data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Prompts système par défaut, par langue (construits une seule fois à l'import)
+_DEFAULT_SYSTEM_PROMPTS = {
+    "fr": """Tu es un assistant IA utile et amical. Tu dois TOUJOURS répondre en français.
+
+RÈGLES IMPORTANTES:
+- Tu es en mode "assistant sécurisé" : tu ne peux que SUGGÉRER, jamais EXÉCUTER
+- Pour toute modification de fichier, tu dois fournir un DIFF explicite
+- Tu ne dois jamais proposer d'exécuter des commandes système sans validation utilisateur
+- Si tu ne connais pas quelque chose, dis-le clairement
+- Sois concis et précis dans tes réponses""",
+
+    "en": """You are a helpful and friendly AI assistant. You must ALWAYS respond in English.
+
+IMPORTANT RULES:
+- You are in "secure assistant mode": you can only SUGGEST, never EXECUTE
+- For any file modification, you must provide an explicit DIFF
+- You must never propose to execute system commands without user validation
+- If you don't know something, say so clearly
+- Be concise and precise in your answers"""
+}
+
+# En-têtes constants des sections du prompt (identiques d'un appel à l'autre,
+# ce qui garde un préfixe stable pour le cache KV côté modèle)
+_HDR_CONTEXT_FILES = "\n\n--- CONTEXTE (FICHIERS) ---\n\n"
+_SEP_CONTEXT = "\n\n---\n\n"
+_HDR_MEMORY = "\n\n--- MÉMOIRE ---\n\n"
+_HDR_WEB = "=== WEB RESULTS ===\n"
+
+# Libellés du contexte repository par langue :
+# (en-tête, titre des langages, unité "fichiers", titre des outils)
+_REPO_CONTEXT_LABELS = {
+    "fr": ("=== CONTEXTE REPOSITORY ===", "Langages détectés:", "fichiers", "Outils"),
+    "en": ("=== REPOSITORY CONTEXT ===", "Detected languages:", "files", "Tools"),
+}
+
+# Rôles acceptés dans l'historique de conversation
+_VALID_ROLES = frozenset(("user", "assistant"))
+
+
+@functools.lru_cache(maxsize=256)
+def _dumps_meta_items(items: tuple) -> str:
+    """Encode (mis en cache) des métadonnées données en triplets (clé, valeur, type)"""
+    return json.dumps({key: value for key, value, _ in items}, ensure_ascii=False)
+
+
+def _dumps_meta(metadata: Dict[str, Any]) -> str:
+    """JSON des métadonnées pour to_string (cache si les valeurs sont hashables)"""
+    try:
+        # Le type fait partie de la clé : 1, 1.0 et True ne partagent pas d'entrée
+        return _dumps_meta_items(tuple((k, v, type(v)) for k, v in metadata.items()))
+    except TypeError:
+        # Valeurs non hashables (ex: liste de fichiers) : encodage direct
+        return json.dumps(metadata, ensure_ascii=False)
+
+
+@dataclass(slots=True)
 class PromptComponent:
     """Composant d'un prompt (système, contexte, mémoire, utilisateur)"""
     type: str  # "system", "context", "memory", "user", "assistant"
@@ -27,7 +99,7 @@ class PromptComponent:
     metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Prompt:
     """Prompt final avec versioning et structure"""
     components: List[PromptComponent]
@@ -42,77 +114,76 @@ class Prompt:
         Returns:
             Liste de messages au format Ollama
         """
-        messages = []
-        
-        # 1. System prompt (règles de base)
-        system_parts = []
+        # Un seul passage sur les composants, répartis par type
+        system_parts, context_parts, memory_parts, tail = [], [], [], []
+        add_tail = tail.append
         for component in self.components:
-            if component.type == "system":
+            ctype = component.type
+            if ctype in _VALID_ROLES:
+                add_tail({
+                    "role": ctype,
+                    "content": component.content
+                })
+            elif ctype == "system":
                 system_parts.append(component.content)
+            elif ctype == "context":
+                context_parts.append(component.content)
+            elif ctype == "memory":
+                memory_parts.append(component.content)
         
+        messages = []
+        append = messages.append
+        
+        # 1. System prompt (règles de base)
         if system_parts:
-            system_content = "\n\n".join(system_parts)
-            messages.append({
+            append({
                 "role": "system",
-                "content": system_content
+                "content": "\n\n".join(system_parts)
             })
         
         # 2. Contexte (fichiers) - ajouté comme système étendu
-        context_parts = []
-        for component in self.components:
-            if component.type == "context":
-                context_parts.append(component.content)
-        
         if context_parts:
-            context_text = "\n\n--- CONTEXTE (FICHIERS) ---\n\n"
-            context_text += "\n\n---\n\n".join(context_parts)
-            messages.append({
+            context_text = _HDR_CONTEXT_FILES + _SEP_CONTEXT.join(context_parts)
+            append({
                 "role": "system",
                 "content": context_text
             })
         
         # 3. Mémoire - ajouté comme système
-        memory_parts = []
-        for component in self.components:
-            if component.type == "memory":
-                memory_parts.append(component.content)
-        
         if memory_parts:
-            memory_text = "\n\n--- MÉMOIRE ---\n\n"
-            memory_text += "\n\n".join(memory_parts)
-            messages.append({
+            memory_text = _HDR_MEMORY + "\n\n".join(memory_parts)
+            append({
                 "role": "system",
                 "content": memory_text
             })
         
-        # 4. Historique de conversation (user/assistant)
-        for component in self.components:
-            if component.type in ["user", "assistant"]:
-                messages.append({
-                    "role": component.type,
-                    "content": component.content
-                })
+        # 4. Historique de conversation (user/assistant), dans l'ordre d'origine
+        messages += tail
         
         return messages
     
-    def to_string(self) -> str:
+    def to_string(self, include_metadata: bool = True) -> str:
         """
         Représentation textuelle du prompt pour affichage UI
         
+        Args:
+            include_metadata: Afficher les métadonnées de chaque composant
+        
         Returns:
             String formaté avec toutes les sections
         """
-        parts = []
-        parts.append(f"=== PROMPT V{self.version} ({self.created_at}) ===\n")
+        buf = io.StringIO()
+        w = buf.write
+        w(f"=== PROMPT V{self.version} ({self.created_at}) ===\n")
         
         for component in self.components:
-            parts.append(f"\n--- {component.type.upper()} ---")
-            if component.metadata:
-                parts.append(f"[Metadata: {json.dumps(component.metadata, ensure_ascii=False)}]")
-            parts.append(component.content)
-            parts.append("")  # Ligne vide
+            w(f"\n\n--- {component.type.upper()} ---\n")
+            if include_metadata and component.metadata:
+                w(f"[Metadata: {_dumps_meta(component.metadata)}]\n")
+            w(component.content)
+            w("\n")  # Ligne vide
         
-        return "\n".join(parts)
+        return buf.getvalue()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit le prompt en dictionnaire pour sérialisation"""
@@ -149,9 +220,14 @@ class PromptBuilderService:
         else:
             self.base_dir = Path(__file__).resolve().parent.parent.parent
         
+        # Dossier d'audit créé à la première écriture (pas à l'import)
         self.audit_dir = self.base_dir / "data" / "audit"
-        self.audit_dir.mkdir(parents=True, exist_ok=True)
         self.prompts_log = self.audit_dir / "prompts.log"
+        self._audit_ready = False
+        
+        # Log asynchrone : les entrées sont mises en file et écrites par lot
+        # par un thread d'arrière-plan, hors de build_prompt
+        self._log_queue = BackgroundQueue("prompt-log", self._write_log_entries)
     
     def build_prompt(
         self,
@@ -178,6 +254,8 @@ class PromptBuilderService:
         Returns:
             Prompt structuré avec versioning
         """
+        # Horodatage unique du prompt (message utilisateur + created_at)
+        now_iso = datetime.now().isoformat()
         components = []
         
         # 1. System prompt (règles de base)
@@ -234,22 +312,20 @@ class PromptBuilderService:
                 }
             ))
 
-        # 6. Historique de conversation
+        # 6. Historique de conversation (composants créés en une compréhension,
+        # arguments positionnels : type, content, metadata)
         if chat_history:
-            for msg in chat_history:
-                role = msg.get("role", "user")
-                if role in ["user", "assistant"]:
-                    components.append(PromptComponent(
-                        type=role,
-                        content=msg.get("content", ""),
-                        metadata={"timestamp": msg.get("timestamp")}
-                    ))
+            components.extend([
+                PromptComponent(role, msg.get("content", ""), {"timestamp": msg.get("timestamp")})
+                for msg in chat_history
+                if (role := msg.get("role", "user")) in _VALID_ROLES
+            ])
         
         # 7. Message utilisateur actuel
         components.append(PromptComponent(
             type="user",
             content=user_message,
-            metadata={"timestamp": datetime.now().isoformat()}
+            metadata={"timestamp": now_iso}
         ))
         
         # Créer le prompt final
@@ -257,7 +333,7 @@ class PromptBuilderService:
         prompt = Prompt(
             version="2.0",
             components=components,
-            created_at=datetime.now().isoformat(),
+            created_at=now_iso,
             prompt_id=prompt_id
         )
         
@@ -268,26 +344,7 @@ class PromptBuilderService:
     
     def _get_default_system_prompt(self, language: str) -> str:
         """Retourne le prompt système par défaut selon la langue"""
-        prompts = {
-            "fr": """Tu es un assistant IA utile et amical. Tu dois TOUJOURS répondre en français.
-
-RÈGLES IMPORTANTES:
-- Tu es en mode "assistant sécurisé" : tu ne peux que SUGGÉRER, jamais EXÉCUTER
-- Pour toute modification de fichier, tu dois fournir un DIFF explicite
-- Tu ne dois jamais proposer d'exécuter des commandes système sans validation utilisateur
-- Si tu ne connais pas quelque chose, dis-le clairement
-- Sois concis et précis dans tes réponses""",
-            
-            "en": """You are a helpful and friendly AI assistant. You must ALWAYS respond in English.
-
-IMPORTANT RULES:
-- You are in "secure assistant mode": you can only SUGGEST, never EXECUTE
-- For any file modification, you must provide an explicit DIFF
-- You must never propose to execute system commands without user validation
-- If you don't know something, say so clearly
-- Be concise and precise in your answers"""
-        }
-        return prompts.get(language, prompts["en"])
+        return _DEFAULT_SYSTEM_PROMPTS.get(language, _DEFAULT_SYSTEM_PROMPTS["en"])
     
     def _format_memory(self, memory_entries: List[Dict[str, Any]]) -> str:
         """Formate les entrées mémoire"""
@@ -300,59 +357,50 @@ IMPORTANT RULES:
     
     def _format_repo_context(self, repo_context: Dict[str, Any], language: str) -> str:
         """Formate le contexte repository"""
-        parts = []
+        # Chaque ligne après l'en-tête est précédée de son saut de ligne
+        header, languages_label, files_label, tools_label = _REPO_CONTEXT_LABELS.get(
+            language, _REPO_CONTEXT_LABELS["en"]
+        )
+        buf = io.StringIO()
+        w = buf.write
+        
+        w(header)
+        if repo_context.get("summary"):
+            w(f"\n{repo_context['summary']}")
         
-        if language == "fr":
-            parts.append("=== CONTEXTE REPOSITORY ===")
-            if repo_context.get("summary"):
-                parts.append(repo_context["summary"])
+        if repo_context.get("stack"):
+            stack = repo_context["stack"]
+            if stack.get("languages"):
+                w(f"\n\n{languages_label}")
+                for lang, count in stack["languages"].items():
+                    w(f"\n  - {lang}: {count} {files_label}")
             
-            if repo_context.get("stack"):
-                stack = repo_context["stack"]
-                if stack.get("languages"):
-                    parts.append("\nLangages détectés:")
-                    for lang, count in stack["languages"].items():
-                        parts.append(f"  - {lang}: {count} fichiers")
-                
-                if stack.get("frameworks"):
-                    parts.append(f"\nFrameworks: {', '.join(stack['frameworks'])}")
-                
-                if stack.get("tools"):
-                    parts.append(f"Outils: {', '.join(stack['tools'])}")
-        else:
-            parts.append("=== REPOSITORY CONTEXT ===")
-            if repo_context.get("summary"):
-                parts.append(repo_context["summary"])
+            if stack.get("frameworks"):
+                w(f"\n\nFrameworks: {', '.join(stack['frameworks'])}")
             
-            if repo_context.get("stack"):
-                stack = repo_context["stack"]
-                if stack.get("languages"):
-                    parts.append("\nDetected languages:")
-                    for lang, count in stack["languages"].items():
-                        parts.append(f"  - {lang}: {count} files")
-                
-                if stack.get("frameworks"):
-                    parts.append(f"\nFrameworks: {', '.join(stack['frameworks'])}")
-                
-                if stack.get("tools"):
-                    parts.append(f"Tools: {', '.join(stack['tools'])}")
+            if stack.get("tools"):
+                w(f"\n{tools_label}: {', '.join(stack['tools'])}")
         
-        return "\n".join(parts)
+        return buf.getvalue()
 
     def _format_web_context(self, web_context: str) -> str:
         """Formate le contexte web"""
-        return "=== WEB RESULTS ===\n" + web_context
+        return _HDR_WEB + web_context
 
     def _format_context(self, files: List[Dict[str, Any]]) -> str:
         """Formate le contexte fichiers"""
-        parts = []
+        buf = io.StringIO()
+        w = buf.write
+        sep = ""
         for file in files:
             path = file.get("path", "")
             content = file.get("content", "")
-            parts.append(f"=== {path} ===")
-            parts.append(content)
-            parts.append("")  # Ligne vide entre fichiers
-        return "\n".join(parts)
+            w(sep)  # Ligne vide entre fichiers
+            w(f"=== {path} ===\n")
+            w(content)
+            w("\n")
+            sep = "\n"
+        return buf.getvalue()
     
     def log_prompt(self, prompt: Prompt):
         """
@@ -377,12 +425,31 @@ IMPORTANT RULES:
         
         self.prompt_history.append(log_entry)
         
-        # Sauvegarder dans fichier audit
-        try:
-            with open(self.prompts_log, "a", encoding="utf-8") as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
-        except Exception as e:
-            print(f"[PROMPT BUILDER ERROR] Failed to log prompt: {e}", file=sys.stderr)
+        # Sauvegarder dans fichier audit (écriture différée par le thread de log)
+        self._log_queue.put(log_entry)
+    
+    def flush_log(self):
+        """Attend l'écriture de toutes les entrées en attente"""
+        self._log_queue.flush()
+    
+    def _write_log_entries(self, entries: List[Dict[str, Any]]):
+        """Écrit un lot d'entrées en un seul write (thread de la file de log)"""
+        lines = []
+        for log_entry in entries:
+            try:
+                lines.append(_dumps(log_entry))
+            except Exception as e:
+                print(f"[PROMPT BUILDER ERROR] Failed to log prompt, entry dropped: {e}", file=sys.stderr)
+        if not lines:
+            return
+        lines.append(b"")
+        
+        # Une erreur d'écriture remonte à BackgroundQueue (lot journalisé comme perdu)
+        if not self._audit_ready:
+            self.prompts_log.parent.mkdir(parents=True, exist_ok=True)
+            self._audit_ready = True
+        with open(self.prompts_log, "ab") as f:
+            f.write(b"\n".join(lines))
     
     def get_prompt_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Retourne l'historique des prompts (métadonnées uniquement)"""
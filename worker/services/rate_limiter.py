@@ -12,10 +12,53 @@ SÉCURITÉ CRITIQUE - Protection contre les attaques
 
 import time
 import sys
-from typing import Dict, Tuple, Optional, Any
-from collections import defaultdict, deque
+import heapq
+from typing import Dict, List, Tuple, Optional, Any
+from array import array
 import hashlib
 
+
+class _RequestWindow:
+    """
+    Compteurs de requêtes par seconde sur une fenêtre glissante
+
+    Tampon circulaire d'une case par seconde (indexé par seconde % taille)
+    avec total courant : vérification O(1), quel que soit le débit.
+    """
+
+    __slots__ = ("counts", "last_second", "total")
+
+    def __init__(self, size: int):
+        self.counts = array("I", [0]) * size
+        self.last_second = 0
+        self.total = 0
+
+    def advance(self, second: int) -> None:
+        """Fait glisser la fenêtre jusqu'à `second` (vide les cases expirées)"""
+        elapsed = second - self.last_second
+        if elapsed <= 0:
+            return
+        counts = self.counts
+        size = len(counts)
+        if elapsed >= size:
+            # Toute la fenêtre a expiré
+            self.counts = array("I", [0]) * size
+            self.total = 0
+        else:
+            total = self.total
+            for s in range(self.last_second + 1, second + 1):
+                i = s % size
+                total -= counts[i]
+                counts[i] = 0
+            self.total = total
+        self.last_second = second
+
+    def add(self, second: int) -> None:
+        """Comptabilise une requête à la seconde courante"""
+        self.counts[second % len(self.counts)] += 1
+        self.total += 1
+
+
 class RateLimiter:
     """
     Système de rate limiting pour protéger les endpoints sensibles
@@ -46,13 +89,17 @@ class RateLimiter:
         }
 
         # Historique des requêtes par commande et IP
-        # Structure: {command: {ip: deque(timestamps)}}
-        self.request_history: Dict[str, Dict[str, deque]] = defaultdict(lambda: defaultdict(deque))
+        # Structure: {command: {ip: _RequestWindow}} (compteurs par seconde)
+        self.request_history: Dict[str, Dict[str, _RequestWindow]] = {}
 
         # Liste de blocage temporaire (IP bloquées)
         # Structure: {ip: unblock_time}
         self.blocked_ips: Dict[str, float] = {}
 
+        # Tas (unblock_time, ip) pour purger les blocages expirés par la tête,
+        # sans parcourir blocked_ips (entrées périmées ignorées au dépilage)
+        self._block_heap: List[Tuple[float, str]] = []
+
         # Durée de blocage (en secondes)
         self.block_duration = 300  # 5 minutes
 
@@ -70,41 +117,52 @@ class RateLimiter:
         Returns:
             (allowed, retry_after_seconds) - retry_after est None si autorisé
         """
-        # 1. Vérifier si l'IP est bloquée
-        if ip in self.blocked_ips:
-            unblock_time = self.blocked_ips[ip]
-            remaining = max(0, unblock_time - time.time())
-            if remaining > 0:
-                return False, int(remaining)
-
-            # Temps de blocage expiré, retirer de la liste
-            del self.blocked_ips[ip]
-
-        # 2. Déterminer la limite pour cette commande
-        limit = self.limits.get(command, self.limits["default"])
-
-        # 3. Nettoyer l'historique (supprimer les timestamps trop anciens)
-        current_time = time.time()
-        history = self.request_history[command][ip]
-
-        # Supprimer les timestamps hors de la fenêtre de temps
-        while history and history[0] < current_time - self.time_window:
-            history.popleft()
+        # Une seule lecture de l'horloge par requête
+        now = time.monotonic()
+        blocked_ips = self.blocked_ips
+        limits = self.limits
+
+        # 1. Vérifier si l'IP est bloquée (blocages expirés purgés : toute
+        # entrée restante a un unblock_time > now)
+        self._sweep_expired(now)
+        unblock_time = blocked_ips.get(ip)
+        if unblock_time is not None:
+            return False, int(unblock_time - now)
+
+        # 2. Déterminer la limite pour cette commande (une seule recherche si connue)
+        limit = limits.get(command)
+        if limit is None:
+            limit = limits["default"]
+
+        # 3. Faire glisser la fenêtre (vider les secondes hors de la fenêtre de temps)
+        current_second = int(now)
+        per_command = self.request_history.get(command)
+        if per_command is None:
+            per_command = self.request_history[command] = {}
+        history = per_command.get(ip)
+        if history is None:
+            history = per_command[ip] = _RequestWindow(int(self.time_window))
+        history.advance(current_second)
 
         # 4. Vérifier si la limite est atteinte
-        if len(history) >= limit:
+        if history.total >= limit:
             # Limite atteinte - bloquer temporairement l'IP
-            self._block_ip(ip)
-            return False, self.block_duration
+            block_duration = self.block_duration
+            self._block_ip(ip, now)
+            return False, block_duration
 
         # 5. Ajouter la requête actuelle à l'historique
-        history.append(current_time)
+        history.add(current_second)
 
         return True, None
 
-    def _block_ip(self, ip: str) -> None:
-        """Bloque une IP temporairement"""
-        self.blocked_ips[ip] = time.time() + self.block_duration
+    def _block_ip(self, ip: str, now: Optional[float] = None) -> None:
+        """Bloque une IP temporairement (à partir de now, par défaut l'heure courante)"""
+        if now is None:
+            now = time.monotonic()
+        unblock_time = now + self.block_duration
+        self.blocked_ips[ip] = unblock_time
+        heapq.heappush(self._block_heap, (unblock_time, ip))
         print(f"[RATE LIMITER] IP {ip} blocked for {self.block_duration} seconds due to rate limiting", file=sys.stderr)
 
     def unblock_ip(self, ip: str) -> bool:
@@ -131,12 +189,18 @@ class RateLimiter:
         Returns:
             True si l'IP est bloquée
         """
-        if ip in self.blocked_ips:
-            if time.time() < self.blocked_ips[ip]:
-                return True
-            # Temps expiré, nettoyer
-            del self.blocked_ips[ip]
-        return False
+        self._sweep_expired(time.monotonic())
+        return ip in self.blocked_ips
+
+    def _sweep_expired(self, now: float) -> None:
+        """Retire les blocages expirés (tête du tas uniquement)"""
+        heap = self._block_heap
+        blocked_ips = self.blocked_ips
+        while heap and heap[0][0] <= now:
+            unblock_time, ip = heapq.heappop(heap)
+            # Ignorer les entrées périmées (IP débloquée ou rebloquée depuis)
+            if blocked_ips.get(ip) == unblock_time:
+                del blocked_ips[ip]
 
     def get_blocked_ips(self) -> Dict[str, int]:
         """Retourne la liste des IPs bloquées avec leur temps restant
@@ -144,16 +208,13 @@ class RateLimiter:
         Returns:
             Dict {ip: seconds_remaining}
         """
-        current_time = time.time()
-        blocked = {}
-        for ip, unblock_time in list(self.blocked_ips.items()):
-            remaining = max(0, unblock_time - current_time)
-            if remaining > 0:
-                blocked[ip] = int(remaining)
-            else:
-                # Nettoyer les entrées expirées
-                del self.blocked_ips[ip]
-        return blocked
+        current_time = time.monotonic()
+        self._sweep_expired(current_time)
+        # Après la purge, toutes les entrées restantes sont encore actives
+        return {
+            ip: int(unblock_time - current_time)
+            for ip, unblock_time in self.blocked_ips.items()
+        }
 
     def set_limit(self, command: str, limit: int) -> None:
         """Définit une limite personnalisée pour une commande
@@ -180,6 +241,10 @@ class RateLimiter:
         }
         print("[RATE LIMITER] All limits reset to defaults", file=sys.stderr)
 
+    def has_limit(self, command: str) -> bool:
+        """Indique si une limite explicite est définie pour cette commande (sans copie)"""
+        return command in self.limits
+
     def get_limits(self) -> Dict[str, int]:
         """Retourne les limites actuelles
 
@@ -199,8 +264,9 @@ class RateLimiter:
         Returns:
             Statistiques d'utilisation
         """
+        self._sweep_expired(time.monotonic())
         return {
-            "blocked_ips_count": len(self.get_blocked_ips()),
+            "blocked_ips_count": len(self.blocked_ips),
             "commands_tracked": len(self.request_history),
             "limits": self.get_limits(),
             "time_window": self.time_window,
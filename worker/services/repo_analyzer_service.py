@@ -1,7 +1,7 @@
 """
 Repo Analyzer Service pour Horizon AI V2
 =========================================
-Service d'analyse de repository avec sandbox obligatoire.
+Service d'analyse de repository en lecture seule.
 
 Fonctionnalités :
 - Analyse de structure (lecture seule)
@@ -10,22 +10,26 @@ Fonctionnalités :
 - Détection de dettes techniques
 
 Sécurité :
-- Sandbox obligatoire (copie temporaire)
-- Lecture seule (jamais d'écriture dans le repo original)
-- Scope limité
+- Lecture seule : analyse en place, aucune écriture dans le repository
+  (les scans n'utilisent que stat / listing / open en lecture)
+- Scope limité (dossiers de dépendances et de build ignorés)
+- Parcours borné (taille, nombre de fichiers, durée) : interrompu au dépassement
 - Aucun git write
 """
 
 import os
 import sys
 import json
-import shutil
-import tempfile
+import stat
+import time
+import hashlib
+import functools
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Import des services
 try:
@@ -37,6 +41,143 @@ except ImportError:
     ActionType = None
 
 
+# Noms ignorés par toutes les analyses (dépendances, builds, caches, VCS) :
+# les dossiers correspondants ne sont jamais parcourus
+_IGNORED_NAMES = frozenset({
+    '.git', 'node_modules', '.venv', 'venv', '__pycache__',
+    '.pytest_cache', '.mypy_cache', 'dist', 'build', '.next',
+    'target', '.idea', '.vscode', '.DS_Store',
+    '.gitignore', '.dockerignore'
+})
+
+
+# Fichiers cachés conservés dans la structure
+_VISIBLE_DOTFILES = frozenset({'.gitignore', '.env.example'})
+
+# Taille max d'un repository analysé (octets, hors éléments ignorés)
+MAX_REPO_SIZE = 500_000_000
+
+# Nombre max de fichiers et durée max (secondes) du parcours d'une analyse :
+# au-delà, le parcours s'arrête aussitôt et l'analyse est refusée
+MAX_REPO_FILES = 100_000
+MAX_ANALYSIS_SECONDS = 60
+
+# Au-delà de cette taille, un fichier n'est pas lu pour compter ses lignes
+# (il est de toute façon signalé comme volumineux)
+MAX_LINE_COUNT_SIZE = 10_000_000
+
+# Seuil "fichier très long" : un fichier de MAX_FILE_LINES octets ou moins ne
+# peut pas le dépasser (chaque ligne compte au moins un octet), inutile de le lire
+MAX_FILE_LINES = 500
+
+# Durée de validité (secondes) d'une analyse mise en cache sur disque. La clé
+# ne suit que le dossier racine (mtime, taille) : un fichier modifié plus
+# profondément n'est pris en compte qu'après expiration. Les entrées sont
+# chiffrées (pas de cache disque sans clé crypto), une seule par repository
+REPO_CACHE_TTL = 3600
+
+# Lectures de la dette technique : lots de fichiers lus en parallèle (open/read
+# relâchent le GIL) pendant que le parcours continue
+TECH_DEBT_BATCH_SIZE = 32
+_read_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="repo-analyzer")
+
+# Langages détectés via les extensions
+_LANGUAGE_EXTENSIONS = {
+    'Python': ['.py'],
+    'JavaScript': ['.js', '.jsx'],
+    'TypeScript': ['.ts', '.tsx'],
+    'Java': ['.java'],
+    'C++': ['.cpp', '.c', '.h'],
+    'Rust': ['.rs'],
+    'Go': ['.go'],
+    'Ruby': ['.rb'],
+    'PHP': ['.php'],
+    'Swift': ['.swift'],
+    'Kotlin': ['.kt'],
+}
+# Index inverse extension -> langage (une recherche dict au lieu d'une boucle)
+_EXT_TO_LANG = {ext: lang for lang, exts in _LANGUAGE_EXTENSIONS.items() for ext in exts}
+
+# Extension -> type de fichier (files_by_type)
+_EXT_TO_TYPE = {
+    '.py': 'python',
+    '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
+    '.java': 'java',
+    '.cpp': 'cpp', '.c': 'cpp', '.h': 'cpp',
+    '.rs': 'rust',
+    '.go': 'go',
+    '.html': 'web', '.css': 'web', '.scss': 'web', '.sass': 'web',
+    '.json': 'config', '.yaml': 'config', '.yml': 'config', '.toml': 'config',
+    '.md': 'documentation', '.txt': 'documentation',
+    '.sh': 'script', '.bash': 'script', '.ps1': 'script', '.bat': 'script',
+}
+
+# Fichiers de configuration -> gestionnaire de paquets
+_CONFIG_FILES = {
+    'package.json': 'npm',
+    'requirements.txt': 'pip',
+    'Pipfile': 'pipenv',
+    'poetry.lock': 'poetry',
+    'Cargo.toml': 'cargo',
+    'pom.xml': 'maven',
+    'build.gradle': 'gradle',
+    'Gemfile': 'bundler',
+    'composer.json': 'composer',
+    'go.mod': 'go modules',
+}
+
+# Fichiers/dossiers marqueurs -> outil
+_TOOL_FILES = {
+    '.github': 'GitHub Actions',
+    'Dockerfile': 'Docker',
+    'docker-compose.yml': 'Docker Compose',
+    '.gitlab-ci.yml': 'GitLab CI',
+    'Jenkinsfile': 'Jenkins',
+    'Makefile': 'Make',
+}
+
+# Marqueurs normalisés (normcase) une fois pour toutes, comparés tels quels
+# aux noms de la racine relevés par le parcours
+_CONFIG_MARKERS = tuple((os.path.normcase(name), manager) for name, manager in _CONFIG_FILES.items())
+_TOOL_MARKERS = tuple((os.path.normcase(name), tool) for name, tool in _TOOL_FILES.items())
+
+
+def _count_lines(data: bytes) -> int:
+    """
+    Nombre de lignes d'un contenu brut, comme une lecture texte en mode
+    universal newlines (LF, CRLF et CR terminent une ligne) : comptage C
+    sur les octets, sans décodage
+    """
+    if not data:
+        return 0
+    count = data.count(b'\n')
+    if b'\r' in data:
+        count += data.count(b'\r') - data.count(b'\r\n')
+    if not data.endswith((b'\n', b'\r')):
+        count += 1  # Dernière ligne sans fin de ligne
+    return count
+
+
+def _suffix(name: str) -> str:
+    """Extension en minuscules d'un nom de fichier (même règle que Path.suffix)"""
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:].lower()
+    return ''
+
+
+@dataclass(slots=True)
+class _WalkResult:
+    """Données collectées par un seul parcours du repository (_walk_once)"""
+    structure: Dict[str, Any]
+    top_level_names: set = field(default_factory=set)  # normcase, marqueurs de stack
+    languages: Dict[str, int] = field(default_factory=dict)
+    tech_debt: List[str] = field(default_factory=list)
+    file_count: int = 0
+    total_size: int = 0
+    limit_error: Optional[str] = None  # Limite dépassée (parcours interrompu)
+
+
 @dataclass
 class RepoAnalysis:
     """Résultat d'analyse de repository"""
@@ -52,10 +193,10 @@ class RepoAnalysis:
 
 class RepoAnalyzerService:
     """
-    Service d'analyse de repository avec sandbox obligatoire
+    Service d'analyse de repository en lecture seule
     
-    Toutes les analyses sont effectuées dans un sandbox (copie temporaire)
-    pour garantir qu'aucune modification n'est faite au repository original.
+    Les analyses sont effectuées directement sur le repository : elles ne
+    font que lister, stat et lire des fichiers, sans jamais y écrire.
     """
     
     def __init__(self):
@@ -69,8 +210,8 @@ class RepoAnalyzerService:
         else:
             self.base_dir = Path(__file__).resolve().parent.parent.parent
         
-        self.sandbox_dir = self.base_dir / "data" / "sandbox"
-        self.sandbox_dir.mkdir(parents=True, exist_ok=True)
+        # Cache disque chiffré des analyses (créé à la première écriture)
+        self.cache_dir = self.base_dir / "data" / "repo_cache"
         
         # Extensions de fichiers à analyser
         self.code_extensions = {
@@ -104,20 +245,30 @@ class RepoAnalyzerService:
             'tauri': ['tauri.conf.json', 'src-tauri'],
             'electron': ['package.json', 'electron'],
         }
+        # Même table compilée : framework -> ensemble de marqueurs normalisés
+        self._framework_markers = tuple(
+            (framework, frozenset(map(os.path.normcase, patterns)))
+            for framework, patterns in self.framework_patterns.items()
+        )
     
     def analyze_repository(
         self,
         repo_path: str,
         max_depth: int = 10,
-        max_files: int = 1000
+        max_files: int = 1000,
+        use_cache: bool = True
     ) -> RepoAnalysis:
         """
-        Analyse un repository dans un sandbox
+        Analyse un repository (en place, lecture seule)
         
         Args:
             repo_path: Chemin du repository à analyser
             max_depth: Profondeur maximale de scan
             max_files: Nombre maximum de fichiers à analyser
+            use_cache: Réutiliser une analyse récente (< REPO_CACHE_TTL) du
+                même repository si sa racine n'a pas changé. La clé ne suit
+                pas les sous-dossiers : False force une nouvelle analyse, qui
+                remplace l'entrée en cache (action "analyser" explicite)
             
         Returns:
             RepoAnalysis avec structure, stack, summary et tech_debt
@@ -127,87 +278,57 @@ class RepoAnalyzerService:
             repo_path = os.path.normpath(repo_path)
             repo_path_obj = Path(repo_path)
             
-            if not repo_path_obj.exists():
+            # Un seul stat : existence, type et clé de cache
+            try:
+                st = os.stat(repo_path)
+            except OSError:
                 raise ValueError(f"Repository path does not exist: {repo_path}")
             
-            if not repo_path_obj.is_dir():
+            if not stat.S_ISDIR(st.st_mode):
                 raise ValueError(f"Repository path is not a directory: {repo_path}")
             
-            # Vérifier la taille du repo avant analyse (limite de sécurité)
-            repo_size = self._calculate_size(repo_path_obj)
-            max_repo_size = 500_000_000  # 500 MB max pour éviter les problèmes de performance
-            
-            if repo_size > max_repo_size:
-                raise ValueError(
-                    f"Repository too large ({repo_size / 1_000_000:.1f} MB). "
-                    f"Maximum allowed: {max_repo_size / 1_000_000:.0f} MB. "
-                    "Please select a smaller directory or subdirectory."
-                )
-            
-            # Créer un sandbox temporaire pour analyse sécurisée
-            sandbox_path = None
-            use_sandbox = True  # Toujours actif en production pour sécurité
+            cache_key = self._cache_key(repo_path, st, max_depth, max_files)
+            analysis = self._load_cached(cache_key) if use_cache else None
             
-            try:
-                if use_sandbox:
-                    # Créer un dossier temporaire unique
-                    self.sandbox_dir.mkdir(parents=True, exist_ok=True)
-                    sandbox_path = tempfile.mkdtemp(prefix="repo_analyzer_", dir=str(self.sandbox_dir))
-                    sandbox_path_obj = Path(sandbox_path)
-                    
-                    # Copier le repository dans le sandbox (lecture seule)
-                    print(f"[RepoAnalyzer] Creating sandbox at: {sandbox_path}", file=sys.stderr)
-                    self._copy_to_sandbox(repo_path_obj, sandbox_path_obj)
-                    print(f"[RepoAnalyzer] Sandbox created successfully", file=sys.stderr)
-                    analysis_path = sandbox_path_obj
-                else:
-                    # Fallback : analyser directement (seulement si sandbox désactivé explicitement)
-                    analysis_path = repo_path_obj
-                
-                # Analyser dans le sandbox ou directement
-                structure = self.analyze_structure(analysis_path, max_depth, max_files)
-                stack = self.detect_stack(analysis_path)
-                summary = self.generate_summary(structure, stack)
-                tech_debt = self.detect_tech_debt(analysis_path, max_files)
-                
-                # Compter les fichiers et calculer la taille
-                file_count = self._count_files(analysis_path)
-                total_size = self._calculate_size(analysis_path)
+            if analysis is None:
+                # Un seul parcours (os.scandir) alimente toutes les analyses
+                walk = self._walk_once(repo_path_obj, max_depth, max_files, enforce_limits=True)
                 
-                # Audit trail
-                if audit_service and AUDIT_AVAILABLE:
-                    try:
-                        audit_service.log_action(
-                            ActionType.FILE_READ,
-                            {
-                                "action": "repo_analysis",
-                                "repo_path": str(repo_path),
-                                "file_count": file_count,
-                                "stack": list(stack.get("languages", {}).keys())
-                            }
-                        )
-                    except Exception:
-                        pass  # Ignorer les erreurs d'audit
+                # Limites de sécurité (taille, nombre de fichiers, durée)
+                if walk.limit_error:
+                    raise ValueError(walk.limit_error)
                 
-                return RepoAnalysis(
+                structure = walk.structure
+                stack = self.detect_stack(repo_path_obj, walk)
+                analysis = RepoAnalysis(
                     repo_path=str(repo_path),
                     structure=structure,
                     stack=stack,
-                    summary=summary,
-                    tech_debt=tech_debt,
+                    summary=self.generate_summary(structure, stack),
+                    tech_debt=walk.tech_debt,
                     analyzed_at=datetime.now().isoformat(),
-                    file_count=file_count,
-                    total_size=total_size
+                    file_count=walk.file_count,
+                    total_size=walk.total_size
                 )
-                
-            finally:
-                # Nettoyer le sandbox
-                if use_sandbox and sandbox_path and Path(sandbox_path).exists():
-                    try:
-                        shutil.rmtree(sandbox_path, ignore_errors=True)
-                    except Exception:
-                        pass  # Ignorer les erreurs de nettoyage
-                        
+                self._store_cached(cache_key, analysis)
+            
+            # Audit trail
+            if audit_service and AUDIT_AVAILABLE:
+                try:
+                    audit_service.log_action(
+                        ActionType.FILE_READ,
+                        {
+                            "action": "repo_analysis",
+                            "repo_path": str(repo_path),
+                            "file_count": analysis.file_count,
+                            "stack": list(analysis.stack.get("languages", {}).keys())
+                        }
+                    )
+                except Exception:
+                    pass  # Ignorer les erreurs d'audit
+            
+            return analysis
+            
         except Exception as e:
             # Logger l'erreur pour le débogage
             import traceback
@@ -215,318 +336,368 @@ class RepoAnalyzerService:
             print(f"[RepoAnalyzer] {error_msg}", file=sys.stderr)
             raise ValueError(f"Failed to analyze repository: {str(e)}")
     
-    def _copy_to_sandbox(self, source: Path, dest: Path):
+    @functools.cached_property
+    def crypto_service(self):
+        """Service de chiffrement (optionnel), importé au premier usage"""
+        try:
+            from services.crypto_service import crypto_service
+            return crypto_service
+        except ImportError:
+            return None
+    
+    def _cache_crypto(self):
+        """crypto_service si une clé est définie (sinon pas de cache disque)"""
+        crypto = self.crypto_service
+        return crypto if crypto and crypto._master_key else None
+    
+    def _cache_key(self, repo_path: str, st: os.stat_result, max_depth: int, max_files: int) -> str:
         """
-        Copie le repository dans le sandbox (ignorant .git et node_modules)
-        
-        Améliorations V2 :
-        - Retry logic pour fichiers verrouillés
-        - Gestion d'erreurs améliorée avec logging
-        - Limites de taille pour éviter les problèmes de performance
+        Clé de cache "<repo>-<état>" : le préfixe identifie le repository (une
+        seule entrée gardée par repo), l'état suit mtime/taille de la racine
+        (st) et les limites de scan
         """
-        ignore_patterns = {
-            '.git', 'node_modules', '.venv', 'venv', '__pycache__',
-            '.pytest_cache', '.mypy_cache', 'dist', 'build', '.next',
-            'target', '.idea', '.vscode', '.DS_Store', 'target',
-            '.gitignore', '.dockerignore'
-        }
-        
-        copied_files = 0
-        skipped_files = 0
-        max_files_in_sandbox = 10_000  # Limite de sécurité
-        
-        def should_ignore(path: Path) -> bool:
-            parts = path.parts
-            return any(part in ignore_patterns for part in parts)
-        
-        def copy_recursive(src: Path, dst: Path, depth: int = 0, retry_count: int = 0):
-            nonlocal copied_files, skipped_files
-            
-            if depth > 20:  # Limiter la profondeur pour éviter les boucles
-                return
-                
-            if copied_files >= max_files_in_sandbox:
-                print(f"[RepoAnalyzer] Warning: Reached max files limit ({max_files_in_sandbox}), stopping copy", file=sys.stderr)
-                return
-                
-            if should_ignore(src):
-                return
-            if src.is_symlink():
-                skipped_files += 1
-                return
-            
-            try:
-                if src.is_file():
-                    # Vérifier la taille du fichier (limite 50 MB par fichier)
-                    try:
-                        file_size = src.stat().st_size
-                        if file_size > 50_000_000:  # 50 MB
-                            skipped_files += 1
-                            return
-                    except (OSError, PermissionError):
-                        skipped_files += 1
-                        return
-                    
-                    try:
-                        # Créer le dossier parent si nécessaire
-                        dst.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(src, dst)
-                        copied_files += 1
-                    except (PermissionError, OSError) as e:
-                        # Retry logic pour fichiers verrouillés (maximum 2 retries)
-                        if retry_count < 2:
-                            import time
-                            time.sleep(0.1)  # Attendre 100ms avant retry
-                            try:
-                                shutil.copy2(src, dst)
-                                copied_files += 1
-                            except Exception:
-                                skipped_files += 1
-                                if retry_count == 0:  # Logger seulement au premier essai
-                                    print(f"[RepoAnalyzer] Warning: Skipped locked file: {src.relative_to(source)}", file=sys.stderr)
-                        else:
-                            skipped_files += 1
-                            if retry_count == 0:
-                                print(f"[RepoAnalyzer] Warning: Skipped file after retries: {src.relative_to(source)}", file=sys.stderr)
-                elif src.is_dir():
-                    try:
-                        dst.mkdir(parents=True, exist_ok=True)
-                        for item in src.iterdir():
-                            if not should_ignore(item):
-                                copy_recursive(item, dst / item.name, depth + 1, retry_count=0)
-                    except (PermissionError, OSError) as e:
-                        skipped_files += 1
-                        if depth == 0:  # Logger seulement au niveau racine
-                            print(f"[RepoAnalyzer] Warning: Skipped directory: {src.relative_to(source)}", file=sys.stderr)
-            except Exception as e:
-                skipped_files += 1
-                # Logger les erreurs importantes uniquement
-                if depth <= 2:  # Logger seulement les erreurs proches de la racine
-                    print(f"[RepoAnalyzer] Warning: Error copying {src.relative_to(source)}: {str(e)}", file=sys.stderr)
-        
+        repo_id = hashlib.sha256(os.path.normcase(repo_path).encode('utf-8')).hexdigest()[:16]
+        state = f"{st.st_mtime_ns}|{st.st_size}|{max_depth}|{max_files}"
+        return f"{repo_id}-{hashlib.sha256(state.encode('utf-8')).hexdigest()[:16]}"
+    
+    def _load_cached(self, cache_key: str) -> Optional[RepoAnalysis]:
+        """Analyse en cache si présente, encore valide et déchiffrable, sinon None"""
+        crypto = self._cache_crypto()
+        if crypto is None:
+            return None
+        cache_file = self.cache_dir / f"{cache_key}.json"
         try:
-            copy_recursive(source, dest)
-            if skipped_files > 0:
-                print(f"[RepoAnalyzer] Sandbox copy completed: {copied_files} files copied, {skipped_files} files skipped", file=sys.stderr)
-            else:
-                print(f"[RepoAnalyzer] Sandbox copy completed: {copied_files} files copied", file=sys.stderr)
+            if time.time() - cache_file.stat().st_mtime > REPO_CACHE_TTL:
+                return None
+            with open(cache_file, 'rb') as f:
+                content = f.read()
+            if not content.startswith(b"ENC:"):
+                return None  # Entrée en clair (ancien format) : jamais relue
+            return RepoAnalysis(**json.loads(crypto.decrypt(memoryview(content)[4:])))
+        except FileNotFoundError:
+            return None
         except Exception as e:
-            # En cas d'erreur critique, nettoyer le sandbox partiel
-            if dest.exists():
-                try:
-                    shutil.rmtree(dest, ignore_errors=True)
-                except Exception:
-                    pass
-            raise ValueError(f"Failed to create sandbox: {str(e)}")
+            print(f"[RepoAnalyzer] Ignoring unreadable cache entry {cache_file.name}: {e}", file=sys.stderr)
+            return None
     
-    def analyze_structure(
+    def _store_cached(self, cache_key: str, analysis: RepoAnalysis):
+        """
+        Écrit l'analyse chiffrée dans le cache (atomique : fichier temporaire +
+        os.replace), puis supprime l'entrée remplacée du même repo et les
+        entrées expirées
+        """
+        crypto = self._cache_crypto()
+        if crypto is None:
+            return  # Jamais d'analyse en clair sur disque
+        cache_file = self.cache_dir / f"{cache_key}.json"
+        tmp_path = cache_file.with_suffix(".json.tmp")
+        try:
+            content = b"ENC:" + crypto.encrypt(json.dumps(asdict(analysis), ensure_ascii=False).encode('utf-8'))
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, cache_file)
+        except Exception as e:
+            print(f"[RepoAnalyzer] Error writing analysis cache: {e}", file=sys.stderr)
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return
+        self._prune_cache(cache_key)
+    
+    def _prune_cache(self, keep_key: str):
+        """Supprime les entrées expirées et les autres entrées du repo de keep_key"""
+        repo_prefix = keep_key.split('-', 1)[0] + '-'
+        keep_name = f"{keep_key}.json"
+        expired_before = time.time() - REPO_CACHE_TTL
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name == keep_name:
+                        continue
+                    try:
+                        if entry.name.startswith(repo_prefix) or entry.stat().st_mtime < expired_before:
+                            os.unlink(entry.path)
+                    except OSError:
+                        pass  # Supprimée entre-temps
+        except OSError as e:
+            print(f"[RepoAnalyzer] Error pruning analysis cache: {e}", file=sys.stderr)
+    
+    def _walk_once(
         self,
         root_path: Path,
         max_depth: int = 10,
-        max_files: int = 1000
-    ) -> Dict[str, Any]:
+        max_files: int = 1000,
+        with_tech_debt: bool = True,
+        structure_only: bool = False,
+        enforce_limits: bool = False
+    ) -> _WalkResult:
         """
-        Analyse uniquement la structure du repository (pas le contenu)
+        Parcourt le repository une seule fois (os.scandir, sans suivre les liens)
+        
+        Chaque entrée n'est listée et stat-ée qu'une fois ; le même parcours
+        alimente la structure (bornée par max_depth/max_files, sans dossiers
+        cachés), les langages, le nombre de fichiers, la taille totale et la
+        dette technique (max_files fichiers de code). Les éléments de
+        _IGNORED_NAMES ne sont jamais parcourus.
+        
+        Avec structure_only, seule la structure est garantie complète : les
+        entrées hors structure ne sont ni stat-ées ni parcourues, et le
+        parcours s'arrête dès que max_files fichiers sont relevés.
+        
+        Avec enforce_limits, le parcours s'interrompt dès que MAX_REPO_SIZE,
+        MAX_REPO_FILES ou MAX_ANALYSIS_SECONDS est dépassé (limit_error
+        renseigné) : un repository hostile ne peut pas épuiser le worker.
         
         Returns:
-            Dict avec structure, fichiers par type, etc.
+            _WalkResult
         """
         structure = {
             "root": str(root_path),
             "directories": [],
-            "files_by_extension": defaultdict(int),
+            "files_by_extension": {},
             "files_by_type": defaultdict(list),
             "depth": 0,
             "total_files": 0
         }
+        result = _WalkResult(structure=structure)
+        directories = structure["directories"]
+        # Extensions accumulées en liste, comptées en C (Counter) après le parcours
+        all_extensions = []
+        structure_extensions = []
+        files_by_type = structure["files_by_type"]
+        languages = result.languages
+        top_level_names = result.top_level_names
+        code_extensions = self.code_extensions
+        structure_files = 0
+        code_files = 0
+        deadline = time.monotonic() + MAX_ANALYSIS_SECONDS
+        pending_debt = []  # Lot courant de (chemin, chemin relatif, taille)
+        debt_batches = []  # Futures des lots soumis, dans l'ordre du parcours
         
-        file_count = 0
-        
-        def scan_directory(path: Path, depth: int = 0):
-            nonlocal file_count
-            
-            if depth > max_depth or file_count >= max_files:
-                return
-            
-            if not path.exists() or not path.is_dir():
-                return
-            
+        def open_dir(path: str):
             try:
-                items = list(path.iterdir())
-                for item in items:
-                    if file_count >= max_files:
-                        break
-                    
-                    try:
-                        # Ignorer les dossiers système
-                        if item.name.startswith('.') and item.name not in ['.gitignore', '.env.example']:
-                            continue
-                        if item.is_symlink():
-                            continue
-                        
-                        if item.is_dir():
-                            if depth < max_depth:
-                                try:
-                                    rel_path = str(item.relative_to(root_path))
-                                    structure["directories"].append(rel_path)
-                                    scan_directory(item, depth + 1)
-                                except (ValueError, OSError):
-                                    pass  # Ignorer les erreurs de chemin relatif
-                        elif item.is_file():
-                            file_count += 1
-                            ext = item.suffix.lower()
-                            structure["files_by_extension"][ext] += 1
-                            
-                            # Classer par type
-                            file_type = self._classify_file_type(ext)
-                            try:
-                                rel_path = str(item.relative_to(root_path))
-                                size = item.stat().st_size if item.exists() else 0
-                                structure["files_by_type"][file_type].append({
-                                    "path": rel_path,
-                                    "size": size
-                                })
-                            except (ValueError, OSError):
-                                pass  # Ignorer les erreurs
-                    except (PermissionError, OSError):
-                        pass  # Ignorer les erreurs d'accès
-            except (PermissionError, OSError):
-                pass  # Ignorer les erreurs de permission
+                return os.scandir(path)
+            except OSError:
+                return None  # Ignorer les erreurs de permission
         
+        root_str = str(root_path)
+        # Chemins relatifs tirés de entry.path (déjà construit par scandir),
+        # uniquement quand ils sont utilisés
+        prefix_len = len(os.path.join(root_str, ''))
+        root_it = open_dir(root_str)
+        # Pile de (itérateur, profondeur, dans la structure)
+        stack = [(root_it, 0, True)] if root_it is not None else []
         try:
-            scan_directory(root_path)
+            while stack:
+                it, depth, in_structure = stack[-1]
+                try:
+                    entry = next(it, None)
+                except OSError:
+                    entry = None
+                if entry is None:
+                    it.close()
+                    stack.pop()
+                    continue
+                
+                name = entry.name
+                if depth == 0:
+                    top_level_names.add(os.path.normcase(name))
+                if name in _IGNORED_NAMES:
+                    continue
+                # Structure : dossiers cachés exclus, profondeur et nombre bornés
+                visible = in_structure and (name[0] != '.' or name in _VISIBLE_DOTFILES)
+                if structure_only and not visible:
+                    continue
+                
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        child_in_structure = visible and depth < max_depth and structure_files < max_files
+                        if child_in_structure:
+                            directories.append(entry.path[prefix_len:])
+                        elif structure_only:
+                            continue
+                        sub_it = open_dir(entry.path)
+                        if sub_it is not None:
+                            stack.append((sub_it, depth + 1, child_in_structure))
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue  # Ignorer les erreurs d'accès
+                
+                result.file_count += 1
+                result.total_size += size
+                if enforce_limits:
+                    if result.total_size > MAX_REPO_SIZE:
+                        result.limit_error = (
+                            f"Repository too large (over {MAX_REPO_SIZE / 1_000_000:.0f} MB). "
+                            "Please select a smaller directory or subdirectory."
+                        )
+                        break
+                    if result.file_count > MAX_REPO_FILES:
+                        result.limit_error = (
+                            f"Repository has too many files (over {MAX_REPO_FILES}). "
+                            "Please select a smaller directory or subdirectory."
+                        )
+                        break
+                    # Horloge consultée tous les 1024 fichiers
+                    if not result.file_count & 1023 and time.monotonic() > deadline:
+                        result.limit_error = (
+                            f"Repository analysis timed out (over {MAX_ANALYSIS_SECONDS} s). "
+                            "Please select a smaller directory or subdirectory."
+                        )
+                        break
+                ext = _suffix(name)
+                all_extensions.append(ext)
+                
+                # Structure
+                if visible and structure_files < max_files:
+                    structure_files += 1
+                    structure_extensions.append(ext)
+                    files_by_type[_EXT_TO_TYPE.get(ext, 'other')].append({
+                        "path": entry.path[prefix_len:],
+                        "size": size
+                    })
+                    if structure_only and structure_files >= max_files:
+                        break  # Structure complète : inutile de lister la suite
+                
+                # Dette technique (fichiers de code uniquement)
+                if with_tech_debt and ext in code_extensions and code_files < max_files:
+                    code_files += 1
+                    if size <= MAX_FILE_LINES:
+                        continue
+                    pending_debt.append((entry.path, entry.path[prefix_len:], size))
+                    if len(pending_debt) >= TECH_DEBT_BATCH_SIZE:
+                        debt_batches.append(self._submit_tech_debt(pending_debt))
+                        pending_debt = []
         except Exception as e:
-            # Si l'analyse échoue, retourner une structure minimale
-            print(f"[RepoAnalyzer] Error scanning structure: {e}", file=sys.stderr)
+            # Si le parcours échoue, garder ce qui a été collecté
+            print(f"[RepoAnalyzer] Error scanning repository: {e}", file=sys.stderr)
+        finally:
+            for it, _, _ in stack:
+                it.close()
         
-        structure["total_files"] = file_count
-        structure["files_by_extension"] = dict(structure["files_by_extension"])
-        structure["files_by_type"] = {
-            k: v for k, v in structure["files_by_type"].items()
-        }
+        # Résultats de dette technique dans l'ordre du parcours
+        if pending_debt:
+            debt_batches.append(self._submit_tech_debt(pending_debt))
+        for batch in debt_batches:
+            try:
+                result.tech_debt.extend(batch.result())
+            except Exception as e:
+                print(f"[RepoAnalyzer] Error detecting tech debt: {e}", file=sys.stderr)
         
-        return structure
+        # Langages : une recherche par extension distincte, pas par fichier
+        for ext, count in Counter(all_extensions).items():
+            lang = _EXT_TO_LANG.get(ext)
+            if lang:
+                languages[lang] = languages.get(lang, 0) + count
+        
+        structure["total_files"] = structure_files
+        structure["files_by_extension"] = dict(Counter(structure_extensions))
+        structure["files_by_type"] = dict(files_by_type)
+        return result
+    
+    def _submit_tech_debt(self, batch: List[tuple]):
+        """Soumet un lot de fichiers au pool de lecture (exécuté sur place si le pool est arrêté)"""
+        try:
+            return _read_pool.submit(self._check_tech_debt_batch, batch)
+        except RuntimeError:
+            # Pool arrêté (fin d'interpréteur) : exécution synchrone
+            future = Future()
+            future.set_result(self._check_tech_debt_batch(batch))
+            return future
+    
+    def _check_tech_debt_batch(self, batch: List[tuple]) -> List[str]:
+        """Problèmes de dette technique d'un lot de (chemin, chemin relatif, taille)"""
+        tech_debt = []
+        for path, rel_path, size in batch:
+            self._check_tech_debt(path, rel_path, size, tech_debt)
+        return tech_debt
+    
+    def _check_tech_debt(self, path: str, rel_path: str, size: int, tech_debt: List[str]):
+        """Ajoute à tech_debt les problèmes d'un fichier de code (trop long, volumineux)"""
+        # Compter les lignes (octets bruts), sauf pour les très gros fichiers
+        line_count = 0
+        if size <= MAX_LINE_COUNT_SIZE:
+            try:
+                with open(path, 'rb') as f:
+                    line_count = _count_lines(f.read())
+            except (OSError, MemoryError):
+                return  # Ignorer les erreurs de lecture
+        
+        # Détecter les fichiers trop longs
+        if line_count > MAX_FILE_LINES:
+            tech_debt.append(f"Fichier très long ({line_count} lignes): {rel_path}")
+        
+        # Détecter les fichiers très volumineux
+        if size > 1_000_000:  # > 1MB
+            tech_debt.append(f"Fichier volumineux ({size / 1_000_000:.1f} MB): {rel_path}")
+    
+    def analyze_structure(
+        self,
+        root_path: Path,
+        max_depth: int = 10,
+        max_files: int = 1000
+    ) -> Dict[str, Any]:
+        """
+        Analyse uniquement la structure du repository (pas le contenu)
+        
+        Returns:
+            Dict avec structure, fichiers par type, etc.
+        """
+        return self._walk_once(Path(root_path), max_depth, max_files, with_tech_debt=False, structure_only=True).structure
     
     def _classify_file_type(self, extension: str) -> str:
         """Classifie un fichier par type"""
-        if extension in ['.py']:
-            return 'python'
-        elif extension in ['.js', '.jsx', '.ts', '.tsx']:
-            return 'javascript'
-        elif extension in ['.java']:
-            return 'java'
-        elif extension in ['.cpp', '.c', '.h']:
-            return 'cpp'
-        elif extension in ['.rs']:
-            return 'rust'
-        elif extension in ['.go']:
-            return 'go'
-        elif extension in ['.html', '.css', '.scss', '.sass']:
-            return 'web'
-        elif extension in ['.json', '.yaml', '.yml', '.toml']:
-            return 'config'
-        elif extension in ['.md', '.txt']:
-            return 'documentation'
-        elif extension in ['.sh', '.bash', '.ps1', '.bat']:
-            return 'script'
-        else:
-            return 'other'
+        return _EXT_TO_TYPE.get(extension, 'other')
     
-    def detect_stack(self, root_path: Path) -> Dict[str, Any]:
+    def detect_stack(
+        self,
+        root_path: Path,
+        walk: Optional[_WalkResult] = None
+    ) -> Dict[str, Any]:
         """
         Détecte la stack technique via fichiers de configuration et extensions
+        
+        Args:
+            root_path: Racine du repository
+            walk: Parcours déjà effectué par _walk_once (sinon parcours dédié)
         """
+        if walk is None:
+            walk = self._walk_once(Path(root_path), with_tech_debt=False)
+        
         stack = {
-            "languages": {},
+            "languages": walk.languages,
             "frameworks": [],
             "tools": [],
             "package_managers": []
         }
         
         try:
-            # Détecter les langages via extensions
-            language_extensions = {
-                'Python': ['.py'],
-                'JavaScript': ['.js', '.jsx'],
-                'TypeScript': ['.ts', '.tsx'],
-                'Java': ['.java'],
-                'C++': ['.cpp', '.c', '.h'],
-                'Rust': ['.rs'],
-                'Go': ['.go'],
-                'Ruby': ['.rb'],
-                'PHP': ['.php'],
-                'Swift': ['.swift'],
-                'Kotlin': ['.kt'],
-            }
-            
-            def count_files_by_language(path: Path):
-                try:
-                    for item in path.rglob('*'):
-                        try:
-                            if item.is_symlink():
-                                continue
-                            if item.is_file():
-                                ext = item.suffix.lower()
-                                for lang, exts in language_extensions.items():
-                                    if ext in exts:
-                                        stack["languages"][lang] = stack["languages"].get(lang, 0) + 1
-                                        break
-                        except (PermissionError, OSError):
-                            continue
-                except Exception:
-                    pass  # Ignorer les erreurs
-            
-            count_files_by_language(root_path)
+            # Marqueurs cherchés dans le listing de la racine relevé par le
+            # parcours (pas un exists() par nom)
+            present = walk.top_level_names
             
-            # Détecter les frameworks via fichiers de configuration
-            config_files = {
-                'package.json': 'npm',
-                'requirements.txt': 'pip',
-                'Pipfile': 'pipenv',
-                'poetry.lock': 'poetry',
-                'Cargo.toml': 'cargo',
-                'pom.xml': 'maven',
-                'build.gradle': 'gradle',
-                'Gemfile': 'bundler',
-                'composer.json': 'composer',
-                'go.mod': 'go modules',
-            }
+            # Détecter les gestionnaires de paquets via fichiers de configuration
+            stack["package_managers"].extend(
+                manager for marker, manager in _CONFIG_MARKERS if marker in present
+            )
             
-            for config_file, manager in config_files.items():
-                try:
-                    if (root_path / config_file).exists():
-                        stack["package_managers"].append(manager)
-                except Exception:
-                    pass
-            
-            # Détecter les frameworks
-            for framework, patterns in self.framework_patterns.items():
-                try:
-                    for pattern in patterns:
-                        pattern_path = root_path / pattern
-                        if pattern_path.exists():
-                            if framework not in stack["frameworks"]:
-                                stack["frameworks"].append(framework)
-                            break
-                except Exception:
-                    continue
+            # Détecter les frameworks (intersection d'ensembles, en C)
+            stack["frameworks"].extend(
+                framework for framework, markers in self._framework_markers
+                if not present.isdisjoint(markers)
+            )
             
             # Détecter les outils
-            tool_files = {
-                '.github': 'GitHub Actions',
-                'Dockerfile': 'Docker',
-                'docker-compose.yml': 'Docker Compose',
-                '.gitlab-ci.yml': 'GitLab CI',
-                'Jenkinsfile': 'Jenkins',
-                'Makefile': 'Make',
-            }
-            
-            for tool_file, tool_name in tool_files.items():
-                try:
-                    if (root_path / tool_file).exists():
-                        stack["tools"].append(tool_name)
-                except Exception:
-                    pass
+            stack["tools"].extend(
+                tool for marker, tool in _TOOL_MARKERS if marker in present
+            )
         except Exception as e:
             print(f"[RepoAnalyzer] Error detecting stack: {e}", file=sys.stderr)
         
@@ -573,97 +744,7 @@ class RepoAnalyzerService:
         """
         Détecte des dettes techniques (fichiers trop longs, etc.)
         """
-        tech_debt = []
-        file_count = 0
-        
-        def check_file(path: Path):
-            nonlocal file_count
-            if file_count >= max_files:
-                return
-            if path.is_symlink():
-                return
-            
-            try:
-                if path.is_file() and path.suffix.lower() in self.code_extensions:
-                    file_count += 1
-                    try:
-                        # Compter les lignes
-                        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                            line_count = sum(1 for _ in f)
-                        
-                        # Détecter les fichiers trop longs
-                        if line_count > 500:
-                            try:
-                                rel_path = str(path.relative_to(root_path))
-                                tech_debt.append(
-                                    f"Fichier très long ({line_count} lignes): {rel_path}"
-                                )
-                            except (ValueError, OSError):
-                                pass
-                        
-                        # Détecter les fichiers très volumineux
-                        try:
-                            size = path.stat().st_size
-                            if size > 1_000_000:  # > 1MB
-                                try:
-                                    rel_path = str(path.relative_to(root_path))
-                                    tech_debt.append(
-                                        f"Fichier volumineux ({size / 1_000_000:.1f} MB): {rel_path}"
-                                    )
-                                except (ValueError, OSError):
-                                    pass
-                        except (OSError, PermissionError):
-                            pass
-                    except (IOError, PermissionError, UnicodeDecodeError):
-                        pass  # Ignorer les erreurs de lecture
-            except (PermissionError, OSError):
-                pass  # Ignorer les erreurs d'accès
-        
-        # Scanner récursivement
-        try:
-            for item in root_path.rglob('*'):
-                if file_count >= max_files:
-                    break
-                try:
-                    check_file(item)
-                except Exception:
-                    continue  # Continuer même en cas d'erreur
-        except Exception as e:
-            print(f"[RepoAnalyzer] Error detecting tech debt: {e}", file=sys.stderr)
-        
-        return tech_debt
-    
-    def _count_files(self, path: Path) -> int:
-        """Compte le nombre de fichiers"""
-        count = 0
-        try:
-            for item in path.rglob('*'):
-                try:
-                    if item.is_symlink():
-                        continue
-                    if item.is_file():
-                        count += 1
-                except (PermissionError, OSError):
-                    continue
-        except Exception:
-            pass
-        return count
-    
-    def _calculate_size(self, path: Path) -> int:
-        """Calcule la taille totale"""
-        total = 0
-        try:
-            for item in path.rglob('*'):
-                try:
-                    if item.is_symlink():
-                        continue
-                    if item.is_file():
-                        total += item.stat().st_size
-                except (PermissionError, OSError):
-                    continue
-        except Exception:
-            pass
-        return total
+        return self._walk_once(Path(root_path), max_files=max_files).tech_debt
 
 
 # Instance globale
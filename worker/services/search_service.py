@@ -1,10 +1,19 @@
 import sys
+import time
 try:
     from duckduckgo_search import DDGS
 except ImportError:
     DDGS = None
 
+# Durée de validité (secondes) et taille max du cache des recherches
+SEARCH_CACHE_TTL = 300
+SEARCH_CACHE_SIZE = 256
+
 class SearchService:
+    def __init__(self):
+        # (query, max_results) -> (expiration monotonic, condensé)
+        self._cache = {}
+
     def is_available(self):
         return DDGS is not None
 
@@ -13,16 +22,26 @@ class SearchService:
         try:
             if DDGS is None:
                 return "Recherche web indisponible (dependance manquante)."
+            key = (query, max_results)
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
             print(f"DEBUG: Recherche web pour: {query}", file=sys.stderr)
             with DDGS() as ddgs:
-                results = [r for r in ddgs.text(query, max_results=max_results)]
-                if not results:
+                body = "".join(
+                    f"Titre: {r['title']}\nLien: {r['href']}\nExtrait: {r['body']}\n\n"
+                    for r in ddgs.text(query, max_results=max_results)
+                )
+                if not body:
                     return "Aucun résultat trouvé sur le web."
                 
-                context = "\n--- RÉSULTATS WEB ---\n"
-                for r in results:
-                    context += f"Titre: {r['title']}\nLien: {r['href']}\nExtrait: {r['body']}\n\n"
-                return context
+                context = "\n--- RÉSULTATS WEB ---\n" + body
+            # Mise en cache (les entrées les plus anciennes sont évincées)
+            self._cache.pop(key, None)
+            if len(self._cache) >= SEARCH_CACHE_SIZE:
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, context)
+            return context
         except Exception as e:
             print(f"Erreur de recherche: {e}", file=sys.stderr)
             return "Impossible d'accéder aux données web pour le moment."
@@ -0,0 +1,55 @@
+"""
+Tests pour Background Queue
+===========================
+Vérifie l'ordre de traitement, le vidage et la journalisation des abandons.
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter le chemin parent pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.background_queue import BackgroundQueue
+
+
+class TestBackgroundQueue:
+    """Tests pour la file d'arrière-plan partagée"""
+    
+    def test_items_processed_in_order(self):
+        """Test que flush() attend tous les éléments, dans l'ordre d'arrivée"""
+        written = []
+        log_queue = BackgroundQueue("test-order", written.extend)
+        for i in range(500):
+            log_queue.put(i)
+        log_queue.flush()
+        assert written == list(range(500))
+    
+    def test_flush_without_thread(self):
+        """Test que flush() sans thread démarré ne bloque pas"""
+        written = []
+        BackgroundQueue("test-empty", written.extend).flush()
+        assert written == []
+    
+    def test_handler_error_is_logged(self, capsys):
+        """Test qu'un lot perdu est journalisé et que la file continue"""
+        written = []
+        
+        def handler(batch):
+            if "bad" in batch:
+                raise IOError("disk full")
+            written.extend(batch)
+        
+        log_queue = BackgroundQueue("test-drop", handler)
+        log_queue.put("bad")
+        log_queue.flush()
+        log_queue.put("good")
+        log_queue.flush()
+        
+        assert written == ["good"]
+        assert "[test-drop] Dropped 1 queued item(s): disk full" in capsys.readouterr().err
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
@@ -241,8 +241,7 @@ class TestRepoAnalyzerWorkflow:
         (self.test_repo / "README.md").write_text("# Test Repository")
         
         # Setup services
-        repo_analyzer_service.sandbox_dir = Path(self.test_dir) / "sandbox"
-        repo_analyzer_service.sandbox_dir.mkdir(parents=True, exist_ok=True)
+        repo_analyzer_service.cache_dir = Path(self.test_dir) / "repo_cache"
         
         audit_service.audit_dir = Path(self.test_dir) / "audit"
         audit_service.audit_dir.mkdir(parents=True, exist_ok=True)
@@ -274,9 +273,6 @@ class TestRepoAnalyzerWorkflow:
         
         # Vérifier stack (pour badges)
         assert hasattr(analysis, 'stack') or 'stack' in analysis, "La stack doit être présente"
-        
-        # Vérifier indicateur sandbox (doit être actif après Sprint 1)
-        # Note: Vérifié via sandbox_dir existence et utilisation
     
     def test_repo_tree_structure_generation(self):
         """Vérifier que la structure arborescente peut être générée (pour UI)"""
@@ -33,6 +33,9 @@ class TestE2EWorkflow:
         audit_service.remote_access_log = audit_service.audit_dir / "remote_access.log"
         audit_service.prompts_log = audit_service.audit_dir / "prompts.log"
         
+        # Cache des analyses dans le dossier temporaire (pas dans data/)
+        repo_analyzer_service.cache_dir = Path(self.test_dir) / "repo_cache"
+        
         # Setup crypto service
         crypto_service.set_password("test_password_e2e")
     
@@ -50,6 +50,7 @@ class TestMemoryService:
     
     def teardown_method(self):
         """Cleanup après chaque test"""
+        memory_service.flush_audit()
         if os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
         crypto_service.clear_master_key()
@@ -69,7 +70,8 @@ class TestMemoryService:
         retrieved = memory_service.get_memory("user", "test_key")
         assert retrieved == "test_value"
         
-        # Vérifier l'audit trail
+        # Vérifier l'audit trail (écrit de manière asynchrone)
+        memory_service.flush_audit()
         stats = audit_service.get_log_stats()
         assert stats["total_entries"] >= 1
     
@@ -107,6 +109,15 @@ class TestMemoryService:
         # Vérifier qu'elle n'est pas persistée
         assert not memory_service.user_memory_path.exists()
     
+    def test_session_memory_not_audited_by_default(self):
+        """Test que la mémoire session n'est pas auditée par défaut"""
+        memory_service.save_memory("session", "ephemeral", "value")
+        memory_service.delete_memory("session", "ephemeral")
+        memory_service.flush_audit()
+        
+        stats = audit_service.get_log_stats()
+        assert stats["total_entries"] == 0
+    
     def test_list_memories(self):
         """Test liste des mémoires"""
         # Créer plusieurs mémoires
@@ -140,7 +151,8 @@ class TestMemoryService:
         # Vérifier qu'elle n'existe plus
         assert memory_service.get_memory("user", "to_delete") is None
         
-        # Vérifier l'audit trail
+        # Vérifier l'audit trail (écrit de manière asynchrone)
+        memory_service.flush_audit()
         stats = audit_service.get_log_stats()
         assert stats["total_entries"] >= 2  # MEMORY_WRITE + MEMORY_DELETE
     
@@ -191,6 +203,29 @@ class TestMemoryService:
         retrieved = memory_service.get_memory("user", "update_key")
         assert retrieved == "updated_value"
     
+    def test_store_cache_invalidated_on_external_change(self):
+        """Test que le cache des stores est invalidé si le fichier change sur disque"""
+        memory_service.save_memory("user", "cached_key", "v1")
+        assert memory_service.get_memory("user", "cached_key") == "v1"
+        
+        # Suppression externe du fichier : le cache ne doit plus servir l'entrée
+        memory_service.user_memory_path.unlink()
+        assert memory_service.get_memory("user", "cached_key") is None
+    
+    def test_returned_values_do_not_alias_cache(self):
+        """Test que modifier une valeur lue n'altère pas le store en cache"""
+        memory_service.save_memory("user", "list_key", ["a"])
+        
+        retrieved = memory_service.get_memory("user", "list_key")
+        retrieved.append("b")
+        assert memory_service.get_memory("user", "list_key") == ["a"]
+        
+        # Une valeur sauvegardée puis modifiée par l'appelant ne fuit pas non plus
+        value = {"n": 1}
+        memory_service.save_memory("user", "dict_key", value)
+        value["n"] = 2
+        assert memory_service.get_memory("user", "dict_key") == {"n": 1}
+    
     def test_memory_with_metadata(self):
         """Test mémoire avec métadonnées"""
         metadata = {"source": "test", "version": "1.0"}
@@ -0,0 +1,125 @@
+"""
+Tests pour Project Service
+===========================
+Vérifie la persistance des projets et le cache mémoire du fichier projects.json.
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+import threading
+from pathlib import Path
+
+# Ajouter le chemin parent pour les imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import project_service as project_module
+from services.project_service import project_service
+
+
+class TestProjectService:
+    """Tests pour le service de projets"""
+    
+    def setup_method(self):
+        """Setup avant chaque test"""
+        # Créer un dossier temporaire pour les tests
+        self.test_dir = tempfile.mkdtemp()
+        
+        # Rediriger le stockage vers le dossier temporaire (en clair)
+        self._saved = (project_service.projects_dir, project_service.projects_file, project_service.crypto_service)
+        project_service.projects_dir = Path(self.test_dir)
+        project_service.projects_file = project_service.projects_dir / "projects.json"
+        project_service.crypto_service = None
+        project_service._set_cache(None)
+    
+    def teardown_method(self):
+        """Cleanup après chaque test"""
+        project_service.flush()
+        project_service.projects_dir, project_service.projects_file, project_service.crypto_service = self._saved
+        project_service._set_cache(None)
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+    
+    def test_create_and_reload_project(self):
+        """Test création puis relecture depuis le disque"""
+        project = project_service.create_project("Demo", description="desc")
+        
+        # Forcer la relecture du fichier
+        project_service._set_cache(None)
+        loaded = project_service._load_projects()
+        
+        assert [p.id for p in loaded] == [project.id]
+        assert loaded[0].name == "Demo"
+        assert loaded[0].description == "desc"
+    
+    def test_load_uses_cache_until_file_changes(self):
+        """Test que le fichier n'est relu que s'il a changé sur disque"""
+        project_service.create_project("Cached")
+        
+        reads = []
+        original_read = project_service._read_projects
+        project_service._read_projects = lambda: reads.append(1) or original_read()
+        try:
+            project_service._load_projects()
+            project_service._load_projects()
+            assert reads == []
+            
+            # Suppression externe du fichier : le cache ne doit plus servir les projets
+            project_service.projects_file.unlink()
+            assert project_service._load_projects() == []
+        finally:
+            del project_service._read_projects
+
+    
+    def test_timestamp_updates_are_saved(self):
+        """Test que les changements d'horodatages seuls sont bien écrits"""
+        project = project_service.create_project("Stamped")
+        
+        updated = project_service.update_project(project.id, {"lastAccessedAt": "2099-01-01T00:00:00"})
+        project_service._set_cache(None)
+        loaded = project_service._load_projects()[0]
+        assert loaded.lastAccessedAt == "2099-01-01T00:00:00"
+        assert loaded.updatedAt == updated.updatedAt
+
+    
+    def test_access_time_written_on_flush(self):
+        """Test que lastAccessedAt est écrit en différé par flush()"""
+        project = project_service.create_project("Touched")
+        accessed = project_service.get_project(project.id).lastAccessedAt
+        
+        project_service.flush()
+        project_service._set_cache(None)
+        assert project_service._load_projects()[0].lastAccessedAt == accessed
+
+    
+    def test_flush_does_not_overwrite_concurrent_saves(self):
+        """Test qu'un flush (thread du timer) n'écrase pas un projet créé en parallèle"""
+        touched = [project_service.create_project(f"Base {i}") for i in range(3)]
+        saved_max = project_module.TOUCH_LOG_MAX_ENTRIES
+        project_module.TOUCH_LOG_MAX_ENTRIES = 0  # Chaque flush réécrit projects.json
+        stop = threading.Event()
+        
+        def flush_loop():
+            while not stop.is_set():
+                for project in touched:
+                    project_service._touch(project)
+                project_service.flush()
+        
+        flusher = threading.Thread(target=flush_loop)
+        flusher.start()
+        try:
+            created = [project_service.create_project(f"New {i}").id for i in range(50)]
+        finally:
+            stop.set()
+            flusher.join()
+            project_module.TOUCH_LOG_MAX_ENTRIES = saved_max
+        
+        project_service._set_cache(None)
+        ids = {p.id for p in project_service._load_projects()}
+        assert all(project_id in ids for project_id in created)
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-v"])
@@ -5,6 +5,9 @@ Vérifie que les prompts sont construits correctement avec versioning.
 """
 
 import sys
+import json
+import shutil
+import tempfile
 from pathlib import Path
 
 # Ajouter le chemin parent pour les imports
@@ -141,6 +144,25 @@ class TestPromptBuilder:
         assert prompt1.version == "2.0"
         assert prompt2.version == "2.0"
         assert prompt1.prompt_id != prompt2.prompt_id  # IDs uniques
+    
+    def test_log_prompt_written_on_flush(self):
+        """Test que les entrées d'audit sont écrites par lot via flush_log()"""
+        test_dir = tempfile.mkdtemp()
+        saved_log = prompt_builder_service.prompts_log
+        prompt_builder_service.flush_log()
+        prompt_builder_service.prompts_log = Path(test_dir) / "prompts.log"
+        try:
+            prompt1 = prompt_builder_service.build_prompt("Test 1", language="en")
+            prompt2 = prompt_builder_service.build_prompt("Test 2", language="en")
+            prompt_builder_service.flush_log()
+            
+            with open(prompt_builder_service.prompts_log, "r", encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f]
+            assert [e["prompt_id"] for e in entries] == [prompt1.prompt_id, prompt2.prompt_id]
+            assert "content" not in entries[0]["components_metadata"][0]
+        finally:
+            prompt_builder_service.prompts_log = saved_log
+            shutil.rmtree(test_dir)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,23 @@
 """
 Tests pour Repo Analyzer Service
 =================================
-Vérifie que l'analyse de repository fonctionne correctement avec sandbox.
+Vérifie que l'analyse de repository (en place, lecture seule) fonctionne correctement.
 """
 
 import sys
 import os
 import tempfile
 import shutil
+import pytest
 from pathlib import Path
 
 # Ajouter le chemin parent pour les imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from services import repo_analyzer_service as repo_analyzer_module
 from services.repo_analyzer_service import repo_analyzer_service, RepoAnalysis
 from services.audit_service import audit_service, ActionType
+from services.crypto_service import crypto_service
 
 
 class TestRepoAnalyzerService:
@@ -46,9 +49,8 @@ class TestRepoAnalyzerService:
         audit_service.remote_access_log = audit_service.audit_dir / "remote_access.log"
         audit_service.prompts_log = audit_service.audit_dir / "prompts.log"
         
-        # Rediriger le sandbox_dir vers le dossier temporaire
-        repo_analyzer_service.sandbox_dir = Path(self.test_dir) / "sandbox"
-        repo_analyzer_service.sandbox_dir.mkdir(parents=True, exist_ok=True)
+        # Rediriger le cache des analyses vers le dossier temporaire
+        repo_analyzer_service.cache_dir = Path(self.test_dir) / "repo_cache"
     
     def teardown_method(self):
         """Cleanup après chaque test"""
@@ -121,9 +123,8 @@ class TestRepoAnalyzerService:
         assert analysis.file_count > 0
         assert analysis.analyzed_at is not None
     
-    def test_sandbox_isolation(self):
-        """Test que le sandbox isole correctement le repository"""
-        # Analyser le repository (devrait créer un sandbox)
+    def test_analysis_is_read_only(self):
+        """Test que l'analyse (en place) ne modifie pas le repository"""
         analysis = repo_analyzer_service.analyze_repository(
             repo_path=str(self.test_repo),
             max_depth=5,
@@ -188,6 +189,76 @@ class TestRepoAnalyzerService:
         # Le nombre de fichiers analysés ne devrait pas dépasser max_files
         # (selon l'implémentation, cela peut être vérifié dans structure)
         assert analysis.file_count <= 60  # Un peu de marge pour les fichiers de base
+    
+    def test_analysis_cached_until_root_changes(self):
+        """Test que l'analyse est resservie depuis le cache (chiffré) tant que la racine ne change pas"""
+        crypto_service.set_password("test_repo_cache")
+        first = repo_analyzer_service.analyze_repository(str(self.test_repo))
+        cache_files = list(repo_analyzer_service.cache_dir.iterdir())
+        assert len(cache_files) == 1
+        assert cache_files[0].read_bytes().startswith(b"ENC:")
+        
+        walks = []
+        original_walk = repo_analyzer_service._walk_once
+        repo_analyzer_service._walk_once = lambda *args, **kwargs: walks.append(1) or original_walk(*args, **kwargs)
+        try:
+            cached = repo_analyzer_service.analyze_repository(str(self.test_repo))
+            assert walks == []
+            assert cached == first
+            
+            # Nouveau fichier à la racine : mtime modifié, nouvelle analyse
+            (self.test_repo / "main.py").write_text("print('hi')\n")
+            os.utime(self.test_repo, ns=(0, os.stat(self.test_repo).st_mtime_ns + 1_000_000_000))
+            analysis = repo_analyzer_service.analyze_repository(str(self.test_repo))
+            assert walks == [1]
+            assert "Python" in analysis.stack["languages"]
+            
+            # L'entrée remplacée est supprimée
+            assert len(list(repo_analyzer_service.cache_dir.iterdir())) == 1
+        finally:
+            del repo_analyzer_service._walk_once
+            crypto_service.clear_master_key()
+    
+    def test_refresh_sees_nested_changes(self):
+        """Test que use_cache=False voit un fichier ajouté dans un sous-dossier et remplace l'entrée en cache"""
+        crypto_service.set_password("test_repo_cache")
+        try:
+            first = repo_analyzer_service.analyze_repository(str(self.test_repo))
+            assert first.tech_debt == []
+            
+            # Fichier imbriqué : la racine ne change pas, la clé de cache non plus
+            root_mtime = os.stat(self.test_repo).st_mtime_ns
+            (self.test_repo / "src" / "b.py").write_text("# TODO\n" * (repo_analyzer_module.MAX_FILE_LINES + 1))
+            assert os.stat(self.test_repo).st_mtime_ns == root_mtime
+            
+            fresh = repo_analyzer_service.analyze_repository(str(self.test_repo), use_cache=False)
+            assert fresh.file_count == first.file_count + 1
+            assert any("src" in issue and "b.py" in issue for issue in fresh.tech_debt)
+            
+            # L'analyse fraîche remplace l'entrée : les appels suivants la resservent
+            assert repo_analyzer_service.analyze_repository(str(self.test_repo)) == fresh
+            assert len(list(repo_analyzer_service.cache_dir.iterdir())) == 1
+        finally:
+            crypto_service.clear_master_key()
+    
+    def test_no_disk_cache_without_crypto_key(self):
+        """Test qu'aucune analyse n'est écrite en clair sans clé de chiffrement"""
+        crypto_service.clear_master_key()
+        repo_analyzer_service.analyze_repository(str(self.test_repo))
+        assert not repo_analyzer_service.cache_dir.exists()
+    
+    def test_walk_stops_at_file_limit(self):
+        """Test que le parcours s'interrompt au-delà de MAX_REPO_FILES"""
+        for i in range(20):
+            (self.test_repo / f"file_{i}.txt").write_text(f"Content {i}")
+        
+        saved = repo_analyzer_module.MAX_REPO_FILES
+        repo_analyzer_module.MAX_REPO_FILES = 10
+        try:
+            with pytest.raises(ValueError, match="too many files"):
+                repo_analyzer_service.analyze_repository(str(self.test_repo), use_cache=False)
+        finally:
+            repo_analyzer_module.MAX_REPO_FILES = saved
 
 
 if __name__ == "__main__":